@@ -86,10 +86,10 @@ def create_article(
         is_active=payload.is_active,
     )
     db.add(product)
+    log_action(db, current_user.id, "create", "article", f"SKU {product.sku}", commit=False)
     db.commit()
     db.refresh(product)
 
-    log_action(db, current_user.id, "create", "article", f"SKU {product.sku}")
     return {"id": product.id, "sku": product.sku, "message": "Articulo creado"}
 
 
@@ -140,8 +140,8 @@ def update_article(
             new_base_discount_pct=product.base_discount_pct,
         )
     )
+    log_action(db, current_user.id, "update", "article", f"Articulo {product.sku} actualizado", commit=False)
     db.commit()
-    log_action(db, current_user.id, "update", "article", f"Articulo {product.sku} actualizado")
     return {"message": "Articulo actualizado"}
 
 
@@ -157,9 +157,9 @@ def set_article_visibility(
         raise HTTPException(status_code=404, detail="Articulo no encontrado")
 
     product.is_active = visible
-    db.commit()
     status_label = "visible" if visible else "oculto"
-    log_action(db, current_user.id, "visibility", "article", f"Articulo {product.sku} -> {status_label}")
+    log_action(db, current_user.id, "visibility", "article", f"Articulo {product.sku} -> {status_label}", commit=False)
+    db.commit()
     return {"message": "Visibilidad actualizada", "is_active": product.is_active}
 
 
@@ -174,8 +174,8 @@ def logical_delete_article(
         raise HTTPException(status_code=404, detail="Articulo no encontrado")
 
     product.is_active = False
+    log_action(db, current_user.id, "delete", "article", f"Articulo {product.sku} borrado logico", commit=False)
     db.commit()
-    log_action(db, current_user.id, "delete", "article", f"Articulo {product.sku} borrado logico")
     return {"message": "Articulo borrado logicamente", "is_active": product.is_active}
 
 
@@ -4,6 +4,7 @@ from urllib.parse import parse_qs
 from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from pydantic import ValidationError
 from sqlalchemy import select
 from sqlalchemy.orm import Session
@@ -60,7 +61,7 @@ async def login(request: Request, db: Session = Depends(get_db)) -> TokenRespons
         raise HTTPException(status_code=422, detail="Credenciales invalidas")
 
     user = db.scalar(select(User).where(User.email == payload.email))
-    if not user or not verify_password(payload.password, user.hashed_password):
+    if not user or not await run_in_threadpool(verify_password, payload.password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciales invalidas")
 
     token = create_access_token(subject=user.email, token_version=user.token_version)
@@ -138,7 +139,7 @@ async def reset_password(request: Request, db: Session = Depends(get_db)) -> Mes
     if not user:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
 
-    user.hashed_password = hash_password(payload.new_password)
+    user.hashed_password = await run_in_threadpool(hash_password, payload.new_password)
     user.token_version += 1
     reset_token.is_used = True
     reset_token.used_at = now
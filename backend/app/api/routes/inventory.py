@@ -70,10 +70,10 @@ def adjust_inventory(
         created_by=current_user.id,
     )
     db.add(movement)
+    log_action(db, current_user.id, "adjust", "inventory", f"Producto {product.sku}: {signed_quantity}", commit=False)
     db.commit()
     db.refresh(movement)
 
-    log_action(db, current_user.id, "adjust", "inventory", f"Producto {product.sku}: {signed_quantity}")
     return {
         "message": "Inventario actualizado",
         "new_stock": product.stock,
@@ -67,6 +67,6 @@ def create_purchase(
     )
 
     db.add_all([purchase, movement])
+    log_action(db, current_user.id, "create", "purchase", f"Compra total {total}", commit=False)
     db.commit()
-    log_action(db, current_user.id, "create", "purchase", f"Compra total {total}")
     return {"message": "Compra registrada", "purchase_total_usd": total}
@@ -3,12 +3,15 @@ from datetime import datetime, timedelta, timezone
 from io import StringIO
 from uuid import uuid4
 from io import BytesIO
+from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
 from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfgen import canvas
-from sqlalchemy import delete, func, select
+from sqlalchemy import delete, func, insert, select
 from sqlalchemy.orm import Session
 
 from app.api.deps import log_action, require_permission
@@ -18,17 +21,23 @@ from app.models.currency import CurrencyRate
 from app.models.product import Product
 from app.models.role import Role
 from app.models.sale import Sale
-from app.models.system_setting import SystemSetting
 from app.models.user import User
 from app.schemas.sales import InvoiceEditRequest, InvoiceVoidRequest, SaleCreateRequest
+from app.services.system_settings import load_cached_settings
 
 
 router = APIRouter()
 
+PDF_FONT = "Helvetica"
+PDF_FONT_BOLD = "Helvetica-Bold"
+pdfmetrics.getFont(PDF_FONT)
+pdfmetrics.getFont(PDF_FONT_BOLD)
+PDF_ITEM_COLUMNS = (50, 150, 210, 280, 360, 420, 470)
+PDF_ITEM_COLUMN_STEPS = tuple(right - left for left, right in zip(PDF_ITEM_COLUMNS, PDF_ITEM_COLUMNS[1:]))
+
 
 def get_setting_value(db: Session, key: str, default: str = "") -> str:
-    row = db.scalar(select(SystemSetting).where(SystemSetting.key == key))
-    return row.value if row else default
+    return load_cached_settings(db).get(key, default)
 
 
 def get_setting_bool(db: Session, key: str, default: bool) -> bool:
@@ -56,6 +65,10 @@ def is_admin_user(db: Session, user: User) -> bool:
     return bool(role and role.name.lower() == "admin")
 
 
+def pick_field(payload: BaseModel, name: str, default: Any) -> Any:
+    return getattr(payload, name) if name in payload.model_fields_set else default
+
+
 def can_edit_invoice_header(row: Sale, current_user: User, is_admin: bool) -> bool:
     if is_admin:
         return True
@@ -199,11 +212,12 @@ def calculate_commissions_for_lines(lines: list[dict], payment_amount_usd: float
 
     enriched: list[dict] = []
     distributed_paid = 0.0
+    last_index = len(lines) - 1
     for index, line in enumerate(lines):
-        line_total = round(float(line["total_usd"]), 2)
-        if index == len(lines) - 1:
+        if index == last_index:
             amount_paid_line = round(payment_usd - distributed_paid, 2)
         else:
+            line_total = round(float(line["total_usd"]), 2)
             ratio = (line_total / invoice_total) if invoice_total > 0 else 0
             amount_paid_line = round(payment_usd * ratio, 2)
             distributed_paid += amount_paid_line
@@ -213,12 +227,7 @@ def calculate_commissions_for_lines(lines: list[dict], payment_amount_usd: float
         unit_cost = float(product.cost_amount or 0) if product else 0.0
         cost_line = round(unit_cost * quantity, 2)
         profit_line = round(amount_paid_line - cost_line, 2)
-
-        if index == len(lines) - 1:
-            commission_line = round(max(0.0, profit_line) * commission_rate, 2)
-            commission_line = round(max(0.0, commission_line), 2)
-        else:
-            commission_line = round(max(0.0, profit_line) * commission_rate, 2)
+        commission_line = round(max(0.0, profit_line) * commission_rate, 2)
 
         enriched.append(
             {
@@ -254,7 +263,7 @@ def build_invoice_payload(db: Session, invoice_code: str) -> dict:
     product_map = {product.id: product for product in product_rows}
     seller_name = ""
     if first.seller_user_id:
-        seller = db.scalar(select(User).where(User.id == first.seller_user_id))
+        seller = db.execute(select(User.full_name, User.email).where(User.id == first.seller_user_id)).first()
         if seller:
             seller_name = seller.full_name or seller.email
     show_discount = get_setting_bool(db, "show_discount_in_invoice", True)
@@ -348,8 +357,8 @@ def list_sales(
     product_map = {product.id: product for product in products}
     user_ids = {row.seller_user_id for row in rows if row.seller_user_id}
     user_ids.update({row.voided_by for row in rows if row.voided_by})
-    users = db.scalars(select(User).where(User.id.in_(user_ids))).all() if user_ids else []
-    user_map = {user.id: (user.full_name or user.email) for user in users}
+    user_rows = db.execute(select(User.id, User.full_name, User.email).where(User.id.in_(user_ids))).all() if user_ids else []
+    user_map = {user_id: (full_name or email) for user_id, full_name, email in user_rows}
     payload: list[dict] = []
     for row in rows:
         product = product_map.get(row.product_id)
@@ -479,6 +488,7 @@ def create_sale(
     if payload.manual_invoice_total is not None and not admin_mode:
         raise HTTPException(status_code=403, detail="Solo admin puede definir total manual de factura")
 
+    now = datetime.now(timezone.utc)
     currency = (payload.currency_code or "USD").upper()
     currency_exists = db.scalar(select(CurrencyRate).where(CurrencyRate.currency_code == currency))
     if not currency_exists:
@@ -515,7 +525,7 @@ def create_sale(
         manual_total_input_usd = round(float(payload.manual_invoice_total), 2)
         manual_total_original_usd = original_total
         manual_total_set_by = current_user.id
-        manual_total_set_at = datetime.now(timezone.utc)
+        manual_total_set_at = now
 
     invoice_subtotal = calc["subtotal"]
     invoice_discount_amount = calc["discount_amount"]
@@ -523,7 +533,7 @@ def create_sale(
     invoice_tax_amount = calc["tax_amount"]
     invoice_total = calc["total"]
 
-    duplicate_window_start = datetime.now(timezone.utc) - timedelta(hours=24)
+    duplicate_window_start = now - timedelta(hours=24)
     duplicate_rows = db.execute(
         select(
             Sale.invoice_code,
@@ -559,7 +569,7 @@ def create_sale(
 
     seller = resolve_seller(db, current_user, payload.seller_user_id, allow_assign_other=can_assign_other_seller(db, current_user))
     seller_user_id = seller.id
-    sale_date = payload.sale_date or datetime.now(timezone.utc)
+    sale_date = payload.sale_date or now
     payment_currency, payment_amount, payment_rate_to_usd, payment_amount_usd = resolve_payment(
         db,
         payload.payment_currency_code,
@@ -627,9 +637,9 @@ def create_sale(
         )
 
     db.add_all([*sale_rows, *movement_rows])
+    log_action(db, current_user.id, "create", "sale", f"Factura {invoice_code} total {invoice_total}", commit=False)
     db.commit()
 
-    log_action(db, current_user.id, "create", "sale", f"Factura {invoice_code} total {invoice_total}")
     return {
         "message": "Factura registrada",
         "invoice_code": invoice_code,
@@ -710,8 +720,6 @@ def void_invoices(
         row.void_reason = reason
 
     db.add_all(movements)
-    db.commit()
-
     affected_invoices = sorted({row.invoice_code for row in rows})
     log_action(
         db,
@@ -719,7 +727,10 @@ def void_invoices(
         "void",
         "sale",
         f"Facturas anuladas ({len(affected_invoices)}): {', '.join(affected_invoices)}",
+        commit=False,
     )
+    db.commit()
+
     return {
         "message": "Facturas anuladas",
         "voided_invoices": affected_invoices,
@@ -734,6 +745,7 @@ def edit_invoice(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("sales:write")),
 ) -> dict:
+    now = datetime.now(timezone.utc)
     rows = db.scalars(
         select(Sale)
         .where(Sale.invoice_code == invoice_code)
@@ -744,33 +756,36 @@ def edit_invoice(
         raise HTTPException(status_code=404, detail="Factura no encontrada o anulada")
 
     first = rows[0]
+    first_manual_override = first.manual_total_override
+    first_manual_input = first.manual_total_input_usd
+    first_manual_original = first.manual_total_original_usd
     admin_mode = is_admin_user(db, current_user)
     if not can_edit_invoice_header(first, current_user, admin_mode):
         raise HTTPException(status_code=403, detail="No tienes permiso para editar esta factura")
 
-    updates = payload.model_dump(exclude_unset=True)
-    if not updates:
+    changed = payload.model_fields_set
+    if not changed:
         raise HTTPException(status_code=400, detail="No se enviaron cambios")
 
-    if not admin_mode and "items" in updates:
+    if not admin_mode and "items" in changed:
         raise HTTPException(status_code=403, detail="Solo admin puede editar lineas de factura")
-    if not admin_mode and "manual_invoice_total" in updates:
+    if not admin_mode and "manual_invoice_total" in changed:
         raise HTTPException(status_code=403, detail="Solo admin puede definir total manual de factura")
 
-    base_customer_name = str(updates.get("customer_name", first.customer_name)).strip()
+    base_customer_name = str(pick_field(payload, "customer_name", first.customer_name)).strip()
     if not base_customer_name:
         raise HTTPException(status_code=400, detail="Debes indicar el nombre del cliente")
-    base_customer_phone = str(updates.get("customer_phone", first.customer_phone))
-    base_customer_address = str(updates.get("customer_address", first.customer_address))
-    base_customer_rif = str(updates.get("customer_rif", first.customer_rif))
+    base_customer_phone = str(pick_field(payload, "customer_phone", first.customer_phone))
+    base_customer_address = str(pick_field(payload, "customer_address", first.customer_address))
+    base_customer_rif = str(pick_field(payload, "customer_rif", first.customer_rif))
 
     seller = resolve_seller(
         db,
         current_user,
-        updates.get("seller_user_id", first.seller_user_id or first.created_by),
+        pick_field(payload, "seller_user_id", first.seller_user_id or first.created_by),
         allow_assign_other=can_assign_other_seller(db, current_user),
     )
-    sale_date = updates.get("sale_date", first.sale_date or first.created_at)
+    sale_date = pick_field(payload, "sale_date", first.sale_date or first.created_at)
 
     movements: list[InventoryMovement] = []
     calc: dict
@@ -780,7 +795,7 @@ def edit_invoice(
     manual_total_set_by: int | None = None
     manual_total_set_at: datetime | None = None
 
-    replace_lines = admin_mode and ("items" in updates)
+    replace_lines = admin_mode and ("items" in changed)
     if replace_lines:
         incoming_items = payload.items or []
         if not incoming_items:
@@ -858,10 +873,10 @@ def edit_invoice(
 
     requested_manual_total: float | None
     manual_from_existing = False
-    if "manual_invoice_total" in updates:
-        requested_manual_total = updates.get("manual_invoice_total")
-    elif first.manual_total_override:
-        requested_manual_total = first.manual_total_input_usd
+    if "manual_invoice_total" in changed:
+        requested_manual_total = payload.manual_invoice_total
+    elif first_manual_override:
+        requested_manual_total = first_manual_input
         manual_from_existing = True
     else:
         requested_manual_total = None
@@ -871,25 +886,43 @@ def edit_invoice(
         manual_total_override = True
         manual_total_input_usd = round(float(requested_manual_total), 2)
         manual_total_original_usd = original_total
-        if manual_from_existing and "manual_invoice_total" not in updates:
+        if manual_from_existing and "manual_invoice_total" not in changed:
             manual_total_set_by = first.manual_total_set_by
             manual_total_set_at = first.manual_total_set_at
         else:
             manual_total_set_by = current_user.id
-            manual_total_set_at = datetime.now(timezone.utc)
-
-    payment_currency, payment_amount, payment_rate_to_usd, payment_amount_usd = resolve_payment(
-        db,
-        str(updates.get("payment_currency_code", first.payment_currency_code or "USD")),
-        updates.get("payment_amount", first.payment_amount),
-        calc["total"],
-    )
-    commission_pct = get_setting_float(db, "sales_commission_pct", 7.0)
-    commission_lines, invoice_commission_total = calculate_commissions_for_lines(
-        calc["lines"],
-        payment_amount_usd,
-        commission_pct,
+            manual_total_set_at = now
+
+    financials_dirty = (
+        replace_lines
+        or first.payment_amount is None
+        or first.payment_amount_usd is None
+        or any(
+            key in changed
+            for key in ("payment_amount", "payment_currency_code", "manual_invoice_total", "seller_user_id")
+        )
     )
+    if financials_dirty:
+        payment_currency, payment_amount, payment_rate_to_usd, payment_amount_usd = resolve_payment(
+            db,
+            str(pick_field(payload, "payment_currency_code", first.payment_currency_code or "USD")),
+            pick_field(payload, "payment_amount", first.payment_amount),
+            calc["total"],
+        )
+        commission_pct = get_setting_float(db, "sales_commission_pct", 7.0)
+        commission_lines, invoice_commission_total = calculate_commissions_for_lines(
+            calc["lines"],
+            payment_amount_usd,
+            commission_pct,
+        )
+    else:
+        payment_currency = first.payment_currency_code or "USD"
+        payment_amount = first.payment_amount
+        payment_rate_to_usd = first.payment_rate_to_usd
+        payment_amount_usd = first.payment_amount_usd
+        commission_pct = first.commission_pct
+        commission_lines = [{"commission_line_usd": row.commission_amount_usd} for row in rows]
+        invoice_commission_total = round(sum(row.commission_amount_usd for row in rows), 2)
 
     if replace_lines:
         created_at = first.created_at
@@ -897,44 +930,42 @@ def edit_invoice(
         db.execute(delete(Sale).where(Sale.invoice_code == invoice_code).where(Sale.is_voided.is_not(True)))
         db.flush()
 
-        new_rows: list[Sale] = []
-        for line, line_financials in zip(calc["lines"], commission_lines):
-            product = line["product"]
-            new_rows.append(
-                Sale(
-                    invoice_code=invoice_code,
-                    product_id=product.id,
-                    quantity=line["quantity"],
-                    currency_code=first.currency_code,
-                    unit_price_usd=line["unit_price_usd"],
-                    subtotal_usd=line["subtotal_usd"],
-                    discount_pct=calc["discount_pct"],
-                    discount_amount_usd=line["discount_amount_usd"],
-                    tax_pct=line["tax_pct"],
-                    tax_amount_usd=line["tax_amount_usd"],
-                    total_usd=line["total_usd"],
-                    customer_name=base_customer_name,
-                    customer_phone=base_customer_phone,
-                    customer_address=base_customer_address,
-                    customer_rif=base_customer_rif,
-                    seller_user_id=seller.id,
-                    sale_date=sale_date,
-                    payment_currency_code=payment_currency,
-                    payment_amount=payment_amount,
-                    payment_rate_to_usd=payment_rate_to_usd,
-                    payment_amount_usd=payment_amount_usd,
-                    manual_total_override=manual_total_override,
-                    manual_total_input_usd=manual_total_input_usd,
-                    manual_total_original_usd=manual_total_original_usd,
-                    manual_total_set_by=manual_total_set_by,
-                    manual_total_set_at=manual_total_set_at,
-                    commission_pct=commission_pct,
-                    commission_amount_usd=line_financials["commission_line_usd"],
-                    created_by=created_by,
-                    created_at=created_at,
-                )
-            )
-        db.add_all(new_rows)
+        new_rows = [
+            {
+                "invoice_code": invoice_code,
+                "product_id": line["product"].id,
+                "quantity": line["quantity"],
+                "currency_code": first.currency_code,
+                "unit_price_usd": line["unit_price_usd"],
+                "subtotal_usd": line["subtotal_usd"],
+                "discount_pct": calc["discount_pct"],
+                "discount_amount_usd": line["discount_amount_usd"],
+                "tax_pct": line["tax_pct"],
+                "tax_amount_usd": line["tax_amount_usd"],
+                "total_usd": line["total_usd"],
+                "customer_name": base_customer_name,
+                "customer_phone": base_customer_phone,
+                "customer_address": base_customer_address,
+                "customer_rif": base_customer_rif,
+                "seller_user_id": seller.id,
+                "sale_date": sale_date,
+                "payment_currency_code": payment_currency,
+                "payment_amount": payment_amount,
+                "payment_rate_to_usd": payment_rate_to_usd,
+                "payment_amount_usd": payment_amount_usd,
+                "manual_total_override": manual_total_override,
+                "manual_total_input_usd": manual_total_input_usd,
+                "manual_total_original_usd": manual_total_original_usd,
+                "manual_total_set_by": manual_total_set_by,
+                "manual_total_set_at": manual_total_set_at,
+                "commission_pct": commission_pct,
+                "commission_amount_usd": line_financials["commission_line_usd"],
+                "created_by": created_by,
+                "created_at": created_at,
+            }
+            for line, line_financials in zip(calc["lines"], commission_lines)
+        ]
+        db.execute(insert(Sale), new_rows)
     else:
         for row, line_financials in zip(rows, commission_lines):
             row.customer_name = base_customer_name
@@ -949,7 +980,7 @@ def edit_invoice(
             row.payment_amount_usd = payment_amount_usd
             row.commission_pct = commission_pct
             row.commission_amount_usd = line_financials["commission_line_usd"]
-            if "manual_invoice_total" in updates:
+            if "manual_invoice_total" in changed:
                 row.manual_total_override = manual_total_override
                 row.manual_total_input_usd = manual_total_input_usd
                 row.manual_total_original_usd = manual_total_original_usd
@@ -959,9 +990,9 @@ def edit_invoice(
     if movements:
         db.add_all(movements)
 
-    db.commit()
     mode = "admin-line-edit" if replace_lines else "header-edit"
-    log_action(db, current_user.id, "update", "sale", f"Factura {invoice_code} editada ({mode})")
+    log_action(db, current_user.id, "update", "sale", f"Factura {invoice_code} editada ({mode})", commit=False)
+    db.commit()
     return {
         "message": "Factura actualizada",
         "invoice_code": invoice_code,
@@ -978,9 +1009,9 @@ def edit_invoice(
         "payment_difference_usd": round(payment_amount_usd - calc["total"], 2),
         "commission_pct": commission_pct,
         "commission_amount_usd": invoice_commission_total,
-        "manual_total_override": manual_total_override if "manual_invoice_total" in updates else first.manual_total_override,
-        "manual_total_input_usd": manual_total_input_usd if "manual_invoice_total" in updates else first.manual_total_input_usd,
-        "manual_total_original_usd": manual_total_original_usd if "manual_invoice_total" in updates else first.manual_total_original_usd,
+        "manual_total_override": manual_total_override if "manual_invoice_total" in changed else first_manual_override,
+        "manual_total_input_usd": manual_total_input_usd if "manual_invoice_total" in changed else first_manual_input,
+        "manual_total_original_usd": manual_total_original_usd if "manual_invoice_total" in changed else first_manual_original,
         "edit_mode": mode,
     }
 
@@ -994,16 +1025,18 @@ def export_voided_invoices_report(
     if not is_admin_user(db, current_user):
         raise HTTPException(status_code=403, detail="Solo admin puede exportar anulaciones")
 
+    now = datetime.now(timezone.utc)
     rows = db.scalars(
         select(Sale).where(Sale.is_voided.is_(True)).order_by(Sale.voided_at.desc(), Sale.invoice_code.asc())
     ).all()
 
     user_ids = {row.voided_by for row in rows if row.voided_by}
     user_ids.update({row.seller_user_id for row in rows if row.seller_user_id})
-    users = db.scalars(select(User).where(User.id.in_(user_ids))).all() if user_ids else []
-    user_map = {user.id: (user.full_name or user.email) for user in users}
+    user_rows = db.execute(select(User.id, User.full_name, User.email).where(User.id.in_(user_ids))).all() if user_ids else []
+    user_map = {user_id: (full_name or email) for user_id, full_name, email in user_rows}
 
     grouped: dict[str, dict] = {}
+    grouped_cents: dict[str, list[int]] = {}
     for row in rows:
         key = row.invoice_code
         item = grouped.get(key)
@@ -1024,18 +1057,27 @@ def export_voided_invoices_report(
                 "total_usd": 0.0,
             }
             grouped[key] = item
+            grouped_cents[key] = [0, 0, 0, 0]
 
         item["line_count"] += 1
         item["quantity_total"] += row.quantity
-        item["subtotal_usd"] = round(item["subtotal_usd"] + row.subtotal_usd, 2)
-        item["discount_usd"] = round(item["discount_usd"] + row.discount_amount_usd, 2)
-        item["tax_usd"] = round(item["tax_usd"] + row.tax_amount_usd, 2)
-        item["total_usd"] = round(item["total_usd"] + row.total_usd, 2)
+        cents = grouped_cents[key]
+        cents[0] += round(row.subtotal_usd * 100)
+        cents[1] += round(row.discount_amount_usd * 100)
+        cents[2] += round(row.tax_amount_usd * 100)
+        cents[3] += round(row.total_usd * 100)
+
+    for key, item in grouped.items():
+        subtotal_cents, discount_cents, tax_cents, total_cents = grouped_cents[key]
+        item["subtotal_usd"] = subtotal_cents / 100
+        item["discount_usd"] = discount_cents / 100
+        item["tax_usd"] = tax_cents / 100
+        item["total_usd"] = total_cents / 100
 
     items = list(grouped.values())
     if format == "json":
         return {
-            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "generated_at": now.isoformat(),
             "count": len(items),
             "items": items,
         }
@@ -1080,7 +1122,7 @@ def export_voided_invoices_report(
 
     content = output.getvalue()
     output.close()
-    stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    stamp = now.strftime("%Y%m%d-%H%M%S")
     return StreamingResponse(
         iter([content]),
         media_type="text/csv",
@@ -1110,20 +1152,20 @@ def download_invoice_pdf(
     width, height = A4
 
     y = height - 50
-    pdf.setFont("Helvetica-Bold", 16)
+    pdf.setFont(PDF_FONT_BOLD, 16)
     pdf.drawString(50, y, "RECIBO")
     y -= 24
 
-    pdf.setFont("Helvetica", 10)
+    pdf.setFont(PDF_FONT, 10)
     pdf.drawString(50, y, f"Factura: {payload['invoice_code']}")
     pdf.drawString(280, y, f"Fecha: {payload['created_at']}")
     y -= 20
 
     company = payload["company"]
-    pdf.setFont("Helvetica-Bold", 11)
+    pdf.setFont(PDF_FONT_BOLD, 11)
     pdf.drawString(50, y, company["name"])
     y -= 14
-    pdf.setFont("Helvetica", 10)
+    pdf.setFont(PDF_FONT, 10)
     pdf.drawString(50, y, f"Telefono: {company['phone']}")
     y -= 14
     pdf.drawString(50, y, f"Direccion: {company['address']}")
@@ -1132,10 +1174,10 @@ def download_invoice_pdf(
     y -= 20
 
     customer = payload["customer"]
-    pdf.setFont("Helvetica-Bold", 11)
+    pdf.setFont(PDF_FONT_BOLD, 11)
     pdf.drawString(50, y, "Cliente")
     y -= 14
-    pdf.setFont("Helvetica", 10)
+    pdf.setFont(PDF_FONT, 10)
     pdf.drawString(50, y, f"Nombre: {customer['name']}")
     y -= 14
     pdf.drawString(50, y, f"Telefono: {customer['phone']}")
@@ -1145,7 +1187,7 @@ def download_invoice_pdf(
     pdf.drawString(50, y, f"RIF: {customer['rif']}")
     y -= 24
 
-    pdf.setFont("Helvetica-Bold", 10)
+    pdf.setFont(PDF_FONT_BOLD, 10)
     pdf.drawString(50, y, "Producto ID")
     pdf.drawString(150, y, "Cant")
     pdf.drawString(210, y, "Precio")
@@ -1157,23 +1199,33 @@ def download_invoice_pdf(
     pdf.line(50, y, 540, y)
     y -= 14
 
-    pdf.setFont("Helvetica", 10)
+    pdf.setFont(PDF_FONT, 10)
     for item in payload["items"]:
         if y < 90:
             pdf.showPage()
+            pdf.setFont(PDF_FONT, 10)
             y = height - 50
-        pdf.drawString(50, y, str(item["product_id"]))
-        pdf.drawString(150, y, str(item["quantity"]))
-        pdf.drawString(210, y, f"{item['unit_price']:.2f}")
-        pdf.drawString(280, y, f"{item['subtotal']:.2f}")
-        pdf.drawString(360, y, f"{item['discount_amount']:.2f}")
-        pdf.drawString(420, y, f"{item['tax_amount']:.2f}")
-        pdf.drawString(470, y, f"{item['total']:.2f}")
+        text = pdf.beginText(PDF_ITEM_COLUMNS[0], y)
+        text.textOut(str(item["product_id"]))
+        for step, value in zip(
+            PDF_ITEM_COLUMN_STEPS,
+            (
+                str(item["quantity"]),
+                f"{item['unit_price']:.2f}",
+                f"{item['subtotal']:.2f}",
+                f"{item['discount_amount']:.2f}",
+                f"{item['tax_amount']:.2f}",
+                f"{item['total']:.2f}",
+            ),
+        ):
+            text.moveCursor(step, 0)
+            text.textOut(value)
+        pdf.drawText(text)
         y -= 14
 
     y -= 10
     totals = payload["totals"]
-    pdf.setFont("Helvetica-Bold", 10)
+    pdf.setFont(PDF_FONT_BOLD, 10)
     pdf.drawString(320, y, f"Subtotal: {totals['subtotal']:.2f}")
     if totals["show_discount"]:
         y -= 14
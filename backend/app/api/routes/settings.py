@@ -1,13 +1,20 @@
-import json
+import itertools
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import delete, select
+from functools import lru_cache
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, require_permission
+from app.api.deps import get_current_user, require_admin, require_permission
 from app.core.config import get_settings
-from app.db.session import get_db
+from app.db.session import SessionLocal, get_db
 from app.models.currency import CurrencyRate
 from app.models.inventory import InventoryMovement
 from app.models.product import Product
@@ -28,76 +35,190 @@ from app.schemas.settings import (
     RolePermissionsUpdateRequest,
     UserPreferencesUpdateRequest,
 )
-from app.services.bcv import fetch_ves_rate_from_bcv
-from app.services.currency import convert_amount
-from app.services.rbac import available_permissions, parse_permissions
+from app.services.bcv import fetch_cached_ves_rate
+from app.services.currency import convert_amount, invalidate_rate_cache, load_cached_rates
+from app.services.rbac import PERMISSION_CATALOG, available_permissions, parse_permissions
+from app.services.response_cache import cache_etag, cached_response, invalidate_cached
+from app.services.system_settings import invalidate_settings_cache, load_cached_settings
 
 
 router = APIRouter()
 settings = get_settings()
+BACKUP_STREAM_CHUNK = 1000
+NARROW_INSERT_PAGE_SIZE = 2000
+GENERAL_CACHE_KEY = "settings:general"
+CURRENCIES_CACHE_KEY = "settings:currencies"
+RESPONSE_CACHE_TTL = 60
+MODULE_DEFAULTS = ("dashboard", "articles", "inventory", "sales", "purchases", "reports", "settings")
+VALID_MODULES = frozenset(MODULE_DEFAULTS)
+VALID_ROUNDING_MODES = frozenset({"none", "nearest_integer"})
+VALID_THEMES = frozenset({"dark", "light"})
+ENABLED_LANGUAGES = ("es", "en")
+VALID_LANGUAGES = frozenset(ENABLED_LANGUAGES)
+GENERAL_SETTING_KEYS = (
+    "ui_theme_mode",
+    "sales_rounding_mode",
+    "modules_enabled_default",
+    "show_discount_in_invoice",
+    "default_markup_percent",
+    "sales_commission_pct",
+    "invoice_tax_enabled",
+    "invoice_tax_percent",
+)
+
+
+def currency_code_exists(db: Session, code: str) -> bool:
+    if code in load_cached_rates(db):
+        return True
+    if db.scalar(select(CurrencyRate.id).where(CurrencyRate.currency_code == code)) is None:
+        return False
+    invalidate_rate_cache()
+    return True
 
 
 def get_setting_value(db: Session, key: str, default: str = "") -> str:
-    row = db.scalar(select(SystemSetting).where(SystemSetting.key == key))
-    return row.value if row else default
+    return load_cached_settings(db).get(key, default)
 
 
 def set_setting_value(db: Session, key: str, value: str) -> None:
-    row = db.scalar(select(SystemSetting).where(SystemSetting.key == key))
-    if row:
-        row.value = value
-    else:
-        db.add(SystemSetting(key=key, value=value))
+    bulk_upsert_settings(db, {key: value})
+
+
+def bulk_upsert_settings(db: Session, pairs: dict[str, str]) -> None:
+    now = datetime.now(timezone.utc)
+    statement = pg_insert(SystemSetting).values(
+        [{"key": key, "value": value, "updated_at": now} for key, value in pairs.items()]
+    )
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[SystemSetting.key],
+            set_={"value": statement.excluded.value, "updated_at": statement.excluded.updated_at},
+        )
+    )
 
 
 def validate_preferences(db: Session, preferred_language: str, preferred_currency: str) -> tuple[str, str]:
     language = preferred_language.lower()
-    if language not in {"es", "en"}:
+    if language not in VALID_LANGUAGES:
         raise HTTPException(status_code=400, detail="Idioma no permitido")
 
     currency = preferred_currency.upper()
-    exists = db.scalar(select(CurrencyRate).where(CurrencyRate.currency_code == currency))
-    if not exists:
+    if not currency_code_exists(db, currency):
         raise HTTPException(status_code=400, detail="Moneda no registrada")
 
     return language, currency
 
 
-def get_setting_bool(db: Session, key: str, default: bool) -> bool:
-    raw = get_setting_value(db, key, "true" if default else "false").lower()
-    return raw in {"true", "1", "yes"}
+def fetch_settings_bulk(db: Session, keys: tuple[str, ...]) -> dict[str, str]:
+    return dict(db.execute(select(SystemSetting.key, SystemSetting.value).where(SystemSetting.key.in_(keys))).all())
+
+
+def parse_setting_bool(raw: str | None, default: bool) -> bool:
+    if raw is None:
+        return default
+    return raw.lower() in {"true", "1", "yes"}
 
 
-def get_setting_float(db: Session, key: str, default: float) -> float:
-    raw = get_setting_value(db, key, str(default))
+def parse_setting_float(raw: str | None, default: float) -> float:
+    if raw is None:
+        return default
     try:
         return float(raw)
     except ValueError:
         return default
 
 
-def get_setting_json_list(db: Session, key: str, default: list[str]) -> list[str]:
-    raw = get_setting_value(db, key, json.dumps(default))
+def parse_setting_json_list(raw: str | None, default: list[str]) -> list[str]:
+    if not raw:
+        return default
     try:
-        parsed = json.loads(raw)
+        parsed = orjson.loads(raw)
         return parsed if isinstance(parsed, list) else default
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         return default
 
 
-def ensure_admin_user(db: Session, user: User) -> None:
-    role = db.scalar(select(Role).where(Role.id == user.role_id))
-    if not role or role.name.lower() != "admin":
-        raise HTTPException(status_code=403, detail="Solo admin puede usar esta accion")
+def load_fingerprints(db: Session, *columns) -> set[int]:
+    return {hash(tuple(row)) for row in db.execute(select(*columns))}
 
 
-def parse_iso_datetime(value: str | None) -> datetime:
-    if not value:
-        return datetime.now(timezone.utc)
+def load_fingerprints_in_new_session(columns: tuple) -> set[int]:
+    with SessionLocal() as session:
+        return load_fingerprints(session, *columns)
+
+
+def backup_product_updates(item: dict) -> dict:
+    updates: dict = {}
+    if isinstance(item.get("stock"), (int, float)):
+        updates["stock"] = int(item["stock"])
+    for field in ("product_type", "brand", "model"):
+        if isinstance(item.get(field), str):
+            updates[field] = item[field]
+    if isinstance(item.get("currency_code"), str):
+        updates["currency_code"] = item["currency_code"].upper()
+    for field in ("wholesale_price", "retail_price", "final_customer_price"):
+        if isinstance(item.get(field), (int, float)):
+            updates[field] = float(item[field])
+    if isinstance(item.get("is_active"), bool):
+        updates["is_active"] = item["is_active"]
+    return updates
+
+
+@lru_cache(maxsize=8192)
+def parse_cached_iso_datetime(value: str) -> datetime | None:
     try:
-        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return datetime.fromisoformat(value)
     except ValueError:
-        return datetime.now(timezone.utc)
+        return None
+
+
+def parse_iso_datetime(value: str | None, fallback: datetime | None = None) -> datetime:
+    parsed = parse_cached_iso_datetime(value) if value else None
+    return parsed or fallback or datetime.now(timezone.utc)
+
+
+def normalize_currency_code(value: object) -> str:
+    if not value:
+        return "USD"
+    code = str(value)
+    return code if code.isupper() else code.upper()
+
+
+def build_general_settings(db: Session) -> dict:
+    data = fetch_settings_bulk(db, GENERAL_SETTING_KEYS)
+    theme = data.get("ui_theme_mode", "dark")
+    if theme not in VALID_THEMES:
+        theme = "dark"
+
+    rounding = data.get("sales_rounding_mode", "none")
+    if rounding not in VALID_ROUNDING_MODES:
+        rounding = "none"
+
+    return {
+        "modules_enabled_default": parse_setting_json_list(data.get("modules_enabled_default"), list(MODULE_DEFAULTS)),
+        "show_discount_in_invoice": parse_setting_bool(data.get("show_discount_in_invoice"), True),
+        "sales_rounding_mode": rounding,
+        "default_markup_percent": parse_setting_float(data.get("default_markup_percent"), 20.0),
+        "sales_commission_pct": parse_setting_float(data.get("sales_commission_pct"), 7.0),
+        "invoice_tax_enabled": parse_setting_bool(data.get("invoice_tax_enabled"), False),
+        "invoice_tax_percent": parse_setting_float(data.get("invoice_tax_percent"), 16.0),
+        "ui_theme_mode": theme,
+    }
+
+
+def build_currencies_payload(db: Session) -> dict:
+    operational_currency = fetch_settings_bulk(db, ("operational_currency",)).get(
+        "operational_currency", settings.default_currency
+    )
+    rows = db.scalars(select(CurrencyRate).order_by(CurrencyRate.currency_code.asc())).all()
+    return {
+        "base_currency": settings.default_currency,
+        "operational_currency": operational_currency,
+        "rates": [
+            {"currency_code": row.currency_code, "rate_to_usd": row.rate_to_usd, "updated_at": row.updated_at}
+            for row in rows
+        ],
+    }
 
 
 @router.get("/roles")
@@ -123,28 +244,17 @@ def permissions_catalog(_: User = Depends(require_permission("settings:view")))
 
 @router.get("/general")
 def general_settings(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     _: User = Depends(get_current_user),
 ) -> dict:
-    module_defaults = ["dashboard", "articles", "inventory", "sales", "purchases", "reports", "settings"]
-    theme = get_setting_value(db, "ui_theme_mode", "dark")
-    if theme not in {"dark", "light"}:
-        theme = "dark"
-
-    rounding = get_setting_value(db, "sales_rounding_mode", "none")
-    if rounding not in {"none", "nearest_integer"}:
-        rounding = "none"
-
-    return {
-        "modules_enabled_default": get_setting_json_list(db, "modules_enabled_default", module_defaults),
-        "show_discount_in_invoice": get_setting_bool(db, "show_discount_in_invoice", True),
-        "sales_rounding_mode": rounding,
-        "default_markup_percent": get_setting_float(db, "default_markup_percent", 20.0),
-        "sales_commission_pct": get_setting_float(db, "sales_commission_pct", 7.0),
-        "invoice_tax_enabled": get_setting_bool(db, "invoice_tax_enabled", False),
-        "invoice_tax_percent": get_setting_float(db, "invoice_tax_percent", 16.0),
-        "ui_theme_mode": theme,
-    }
+    etag = cache_etag(GENERAL_CACHE_KEY)
+    if etag:
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+    return cached_response(GENERAL_CACHE_KEY, RESPONSE_CACHE_TTL, lambda: build_general_settings(db))
 
 
 @router.put("/general")
@@ -153,27 +263,33 @@ def save_general_settings(
     db: Session = Depends(get_db),
     _: User = Depends(require_permission("settings:write")),
 ) -> dict:
-    valid_modules = {"dashboard", "articles", "inventory", "sales", "purchases", "reports", "settings"}
-    modules = [module for module in payload.modules_enabled_default if module in valid_modules]
+    modules = [module for module in payload.modules_enabled_default if module in VALID_MODULES]
 
-    if payload.sales_rounding_mode not in {"none", "nearest_integer"}:
+    if payload.sales_rounding_mode not in VALID_ROUNDING_MODES:
         raise HTTPException(status_code=400, detail="Modo de redondeo invalido")
-    if payload.ui_theme_mode not in {"dark", "light"}:
+    if payload.ui_theme_mode not in VALID_THEMES:
         raise HTTPException(status_code=400, detail="Tema de interfaz invalido")
     if payload.invoice_tax_percent < 0:
         raise HTTPException(status_code=400, detail="IVA invalido")
     if payload.sales_commission_pct < 0:
         raise HTTPException(status_code=400, detail="Comision de ventas invalida")
 
-    set_setting_value(db, "modules_enabled_default", json.dumps(modules))
-    set_setting_value(db, "show_discount_in_invoice", "true" if payload.show_discount_in_invoice else "false")
-    set_setting_value(db, "sales_rounding_mode", payload.sales_rounding_mode)
-    set_setting_value(db, "default_markup_percent", str(payload.default_markup_percent))
-    set_setting_value(db, "sales_commission_pct", str(payload.sales_commission_pct))
-    set_setting_value(db, "invoice_tax_enabled", "true" if payload.invoice_tax_enabled else "false")
-    set_setting_value(db, "invoice_tax_percent", str(payload.invoice_tax_percent))
-    set_setting_value(db, "ui_theme_mode", payload.ui_theme_mode)
+    bulk_upsert_settings(
+        db,
+        {
+            "modules_enabled_default": orjson.dumps(modules).decode(),
+            "show_discount_in_invoice": "true" if payload.show_discount_in_invoice else "false",
+            "sales_rounding_mode": payload.sales_rounding_mode,
+            "default_markup_percent": str(payload.default_markup_percent),
+            "sales_commission_pct": str(payload.sales_commission_pct),
+            "invoice_tax_enabled": "true" if payload.invoice_tax_enabled else "false",
+            "invoice_tax_percent": str(payload.invoice_tax_percent),
+            "ui_theme_mode": payload.ui_theme_mode,
+        },
+    )
     db.commit()
+    invalidate_settings_cache()
+    invalidate_cached(GENERAL_CACHE_KEY)
 
     return {"message": "Configuracion general actualizada"}
 
@@ -189,10 +305,8 @@ def update_role_permissions(
     if not role:
         raise HTTPException(status_code=404, detail="Rol no encontrado")
 
-    valid_permissions = set(available_permissions())
-    clean_permissions = sorted({perm for perm in payload.permissions if perm in valid_permissions})
-    role.permissions = json.dumps(clean_permissions)
-    db.commit()
+    clean_permissions = sorted(PERMISSION_CATALOG.intersection(payload.permissions))
+    role.permissions = orjson.dumps(clean_permissions).decode()
     return {
         "message": "Permisos actualizados",
         "role_id": role_id,
@@ -204,7 +318,7 @@ def update_role_permissions(
 def languages(_: User = Depends(require_permission("settings:view"))) -> dict:
     return {
         "default": settings.default_language,
-        "enabled": ["es", "en"],
+        "enabled": list(ENABLED_LANGUAGES),
         "ready_for": ["pt", "fr"],
     }
 
@@ -216,7 +330,7 @@ def preference_options(
 ) -> dict:
     currency_rows = db.scalars(select(CurrencyRate).order_by(CurrencyRate.currency_code.asc())).all()
     return {
-        "languages": ["es", "en"],
+        "languages": list(ENABLED_LANGUAGES),
         "currencies": [row.currency_code for row in currency_rows],
         "preferred_language": current_user.preferred_language,
         "preferred_currency": current_user.preferred_currency,
@@ -236,21 +350,32 @@ def users_preferences(
     db: Session = Depends(get_db),
     _: User = Depends(require_permission("settings:view")),
 ) -> list[dict]:
-    role_rows = db.scalars(select(Role)).all()
-    role_map = {role.id: role.name for role in role_rows}
-    user_rows = db.scalars(select(User).order_by(User.id.asc())).all()
+    rows = db.execute(
+        select(
+            User.id,
+            User.email,
+            User.full_name,
+            Role.name.label("role_name"),
+            User.preferred_language,
+            User.preferred_currency,
+            User.telegram_chat_id,
+            User.is_active,
+        )
+        .outerjoin(Role, User.role_id == Role.id)
+        .order_by(User.id.asc())
+    ).all()
     return [
         {
-            "id": user.id,
-            "email": user.email,
-            "full_name": user.full_name,
-            "role": role_map.get(user.role_id, "Sin rol"),
-            "preferred_language": user.preferred_language,
-            "preferred_currency": user.preferred_currency,
-            "telegram_chat_id": user.telegram_chat_id,
-            "is_active": user.is_active,
+            "id": row.id,
+            "email": row.email,
+            "full_name": row.full_name,
+            "role": row.role_name or "Sin rol",
+            "preferred_language": row.preferred_language,
+            "preferred_currency": row.preferred_currency,
+            "telegram_chat_id": row.telegram_chat_id,
+            "is_active": row.is_active,
         }
-        for user in user_rows
+        for row in rows
     ]
 
 
@@ -269,7 +394,6 @@ def save_user_preferences_by_admin(
     user.preferred_language = language
     user.preferred_currency = currency
     user.telegram_chat_id = payload.telegram_chat_id.strip()
-    db.commit()
     return {
         "message": "Preferencias del usuario actualizadas",
         "user_id": user.id,
@@ -289,7 +413,6 @@ def save_my_preferences(
 
     current_user.preferred_language = lang
     current_user.preferred_currency = currency
-    db.commit()
     return {
         "message": "Preferencias actualizadas",
         "preferred_language": lang,
@@ -299,19 +422,17 @@ def save_my_preferences(
 
 @router.get("/currencies")
 def currencies(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     _: User = Depends(require_permission("settings:view")),
 ) -> dict:
-    operational_currency = get_setting_value(db, "operational_currency", settings.default_currency)
-    rows = db.scalars(select(CurrencyRate).order_by(CurrencyRate.currency_code.asc())).all()
-    return {
-        "base_currency": settings.default_currency,
-        "operational_currency": operational_currency,
-        "rates": [
-            {"currency_code": row.currency_code, "rate_to_usd": row.rate_to_usd, "updated_at": row.updated_at.isoformat()}
-            for row in rows
-        ],
-    }
+    etag = cache_etag(CURRENCIES_CACHE_KEY)
+    if etag:
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+    return cached_response(CURRENCIES_CACHE_KEY, RESPONSE_CACHE_TTL, lambda: build_currencies_payload(db))
 
 
 @router.put("/operational-currency")
@@ -321,12 +442,13 @@ def set_operational_currency(
     _: User = Depends(require_permission("settings:write")),
 ) -> dict:
     code = payload.currency_code.upper()
-    exists = db.scalar(select(CurrencyRate).where(CurrencyRate.currency_code == code))
-    if not exists:
+    if not currency_code_exists(db, code):
         raise HTTPException(status_code=400, detail="Moneda no registrada")
 
     set_setting_value(db, "operational_currency", code)
     db.commit()
+    invalidate_settings_cache()
+    invalidate_cached(CURRENCIES_CACHE_KEY)
     return {"message": "Moneda operativa actualizada", "operational_currency": code}
 
 
@@ -349,11 +471,17 @@ def save_receipt_company_settings(
     db: Session = Depends(get_db),
     _: User = Depends(require_permission("settings:write")),
 ) -> dict:
-    set_setting_value(db, "receipt_company_name", payload.company_name)
-    set_setting_value(db, "receipt_company_phone", payload.company_phone)
-    set_setting_value(db, "receipt_company_address", payload.company_address)
-    set_setting_value(db, "receipt_company_rif", payload.company_rif)
+    bulk_upsert_settings(
+        db,
+        {
+            "receipt_company_name": payload.company_name,
+            "receipt_company_phone": payload.company_phone,
+            "receipt_company_address": payload.company_address,
+            "receipt_company_rif": payload.company_rif,
+        },
+    )
     db.commit()
+    invalidate_settings_cache()
     return {"message": "Datos de empresa para recibo actualizados"}
 
 
@@ -383,15 +511,20 @@ def update_currency_rate(
     _: User = Depends(require_permission("settings:write")),
 ) -> dict:
     code = payload.currency_code.upper()
-    rate = db.scalar(select(CurrencyRate).where(CurrencyRate.currency_code == code))
-    if not rate:
-        rate = CurrencyRate(currency_code=code, rate_to_usd=payload.rate_to_usd)
-        db.add(rate)
-    else:
-        rate.rate_to_usd = payload.rate_to_usd
-        rate.updated_at = datetime.now(timezone.utc)
-
+    statement = pg_insert(CurrencyRate).values(
+        currency_code=code,
+        rate_to_usd=payload.rate_to_usd,
+        updated_at=datetime.now(timezone.utc),
+    )
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[CurrencyRate.currency_code],
+            set_={"rate_to_usd": statement.excluded.rate_to_usd, "updated_at": statement.excluded.updated_at},
+        )
+    )
     db.commit()
+    invalidate_rate_cache()
+    invalidate_cached(CURRENCIES_CACHE_KEY)
     return {"message": "Tasa actualizada", "currency_code": code, "rate_to_usd": payload.rate_to_usd}
 
 
@@ -401,19 +534,26 @@ async def update_ves_from_bcv(
     _: User = Depends(require_permission("settings:write")),
 ) -> dict:
     try:
-        rate_to_usd = await fetch_ves_rate_from_bcv()
+        rate_to_usd = await fetch_cached_ves_rate()
     except Exception as exc:
         raise HTTPException(status_code=502, detail=f"No se pudo obtener tasa BCV: {exc}") from exc
 
-    ves = db.scalar(select(CurrencyRate).where(CurrencyRate.currency_code == "VES"))
-    if not ves:
-        ves = CurrencyRate(currency_code="VES", rate_to_usd=rate_to_usd)
-        db.add(ves)
-    else:
-        ves.rate_to_usd = rate_to_usd
-        ves.updated_at = datetime.now(timezone.utc)
-
-    db.commit()
+    statement = pg_insert(CurrencyRate).values(
+        currency_code="VES",
+        rate_to_usd=rate_to_usd,
+        updated_at=datetime.now(timezone.utc),
+    )
+    changed = db.scalar(
+        statement.on_conflict_do_update(
+            index_elements=[CurrencyRate.currency_code],
+            set_={"rate_to_usd": statement.excluded.rate_to_usd, "updated_at": statement.excluded.updated_at},
+            where=CurrencyRate.rate_to_usd != statement.excluded.rate_to_usd,
+        ).returning(CurrencyRate.id)
+    )
+    if changed is not None:
+        db.commit()
+        invalidate_rate_cache()
+        invalidate_cached(CURRENCIES_CACHE_KEY)
     return {
         "message": "Tasa VES actualizada desde BCV",
         "currency_code": "VES",
@@ -422,172 +562,230 @@ async def update_ves_from_bcv(
     }
 
 
-@router.get("/security/backup")
-def export_security_backup(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_permission("settings:view")),
-) -> dict:
-    ensure_admin_user(db, current_user)
+def backup_sale_row(row: Sale) -> dict:
+    return {
+        "id": row.id,
+        "invoice_code": row.invoice_code,
+        "product_id": row.product_id,
+        "quantity": row.quantity,
+        "currency_code": row.currency_code,
+        "unit_price_usd": row.unit_price_usd,
+        "subtotal_usd": row.subtotal_usd,
+        "discount_pct": row.discount_pct,
+        "discount_amount_usd": row.discount_amount_usd,
+        "tax_pct": row.tax_pct,
+        "tax_amount_usd": row.tax_amount_usd,
+        "total_usd": row.total_usd,
+        "customer_name": row.customer_name,
+        "customer_phone": row.customer_phone,
+        "customer_address": row.customer_address,
+        "customer_rif": row.customer_rif,
+        "seller_user_id": row.seller_user_id,
+        "sale_date": row.sale_date,
+        "payment_currency_code": row.payment_currency_code,
+        "payment_amount": row.payment_amount,
+        "payment_rate_to_usd": row.payment_rate_to_usd,
+        "payment_amount_usd": row.payment_amount_usd,
+        "manual_total_override": row.manual_total_override,
+        "manual_total_input_usd": row.manual_total_input_usd,
+        "manual_total_original_usd": row.manual_total_original_usd,
+        "manual_total_set_by": row.manual_total_set_by,
+        "manual_total_set_at": row.manual_total_set_at,
+        "commission_pct": row.commission_pct,
+        "commission_amount_usd": row.commission_amount_usd,
+        "is_voided": row.is_voided,
+        "voided_at": row.voided_at,
+        "voided_by": row.voided_by,
+        "void_reason": row.void_reason,
+        "created_by": row.created_by,
+        "created_at": row.created_at,
+    }
 
-    sales_rows = db.scalars(select(Sale).order_by(Sale.id.asc())).all()
-    purchase_rows = db.scalars(select(Purchase).order_by(Purchase.id.asc())).all()
-    movement_rows = db.scalars(select(InventoryMovement).order_by(InventoryMovement.id.asc())).all()
-    product_rows = db.scalars(select(Product).order_by(Product.id.asc())).all()
-    currency_rows = db.scalars(select(CurrencyRate).order_by(CurrencyRate.currency_code.asc())).all()
-    setting_rows = db.scalars(select(SystemSetting).order_by(SystemSetting.key.asc())).all()
-    sku_rows = db.scalars(select(SkuSequence).order_by(SkuSequence.sequence_key.asc())).all()
-    price_history_rows = db.scalars(select(ProductPriceHistory).order_by(ProductPriceHistory.id.asc())).all()
 
+def backup_purchase_row(row: Purchase) -> dict:
     return {
-        "format": "ridax-backup-v2",
-        "exported_at": datetime.now(timezone.utc).isoformat(),
-        "exported_by": current_user.email,
-        "counts": {
-            "sales": len(sales_rows),
-            "purchases": len(purchase_rows),
-            "inventory_snapshot": len(product_rows),
-            "inventory_movements": len(movement_rows),
-            "currency_rates": len(currency_rows),
-            "system_settings": len(setting_rows),
-            "sku_sequences": len(sku_rows),
-            "product_price_history": len(price_history_rows),
-        },
-        "sales": [
-            {
-                "id": row.id,
-                "invoice_code": row.invoice_code,
-                "product_id": row.product_id,
-                "quantity": row.quantity,
-                "currency_code": row.currency_code,
-                "unit_price_usd": row.unit_price_usd,
-                "subtotal_usd": row.subtotal_usd,
-                "discount_pct": row.discount_pct,
-                "discount_amount_usd": row.discount_amount_usd,
-                "tax_pct": row.tax_pct,
-                "tax_amount_usd": row.tax_amount_usd,
-                "total_usd": row.total_usd,
-                "customer_name": row.customer_name,
-                "customer_phone": row.customer_phone,
-                "customer_address": row.customer_address,
-                "customer_rif": row.customer_rif,
-                "seller_user_id": row.seller_user_id,
-                "sale_date": row.sale_date.isoformat() if row.sale_date else None,
-                "payment_currency_code": row.payment_currency_code,
-                "payment_amount": row.payment_amount,
-                "payment_rate_to_usd": row.payment_rate_to_usd,
-                "payment_amount_usd": row.payment_amount_usd,
-                "manual_total_override": row.manual_total_override,
-                "manual_total_input_usd": row.manual_total_input_usd,
-                "manual_total_original_usd": row.manual_total_original_usd,
-                "manual_total_set_by": row.manual_total_set_by,
-                "manual_total_set_at": row.manual_total_set_at.isoformat() if row.manual_total_set_at else None,
-                "commission_pct": row.commission_pct,
-                "commission_amount_usd": row.commission_amount_usd,
-                "is_voided": row.is_voided,
-                "voided_at": row.voided_at.isoformat() if row.voided_at else None,
-                "voided_by": row.voided_by,
-                "void_reason": row.void_reason,
-                "created_by": row.created_by,
-                "created_at": row.created_at.isoformat(),
-            }
-            for row in sales_rows
-        ],
-        "purchases": [
-            {
-                "id": row.id,
-                "product_id": row.product_id,
-                "quantity": row.quantity,
-                "unit_cost_usd": row.unit_cost_usd,
-                "total_usd": row.total_usd,
-                "supplier_name": row.supplier_name,
-                "purchase_note": row.purchase_note,
-                "created_by": row.created_by,
-                "created_at": row.created_at.isoformat(),
-            }
-            for row in purchase_rows
-        ],
-        "inventory_snapshot": [
-            {
-                "product_id": row.id,
-                "sku": row.sku,
-                "name": row.name,
-                "product_type": row.product_type,
-                "brand": row.brand,
-                "model": row.model,
-                "currency_code": row.currency_code,
-                "final_customer_price": row.final_customer_price,
-                "wholesale_price": row.wholesale_price,
-                "retail_price": row.retail_price,
-                "stock": row.stock,
-                "is_active": row.is_active,
-                "created_at": row.created_at.isoformat(),
-            }
-            for row in product_rows
-        ],
-        "inventory_movements": [
-            {
-                "id": row.id,
-                "product_id": row.product_id,
-                "movement_type": row.movement_type,
-                "quantity": row.quantity,
-                "note": row.note,
-                "created_by": row.created_by,
-                "created_at": row.created_at.isoformat(),
-            }
-            for row in movement_rows
-        ],
-        "currency_rates": [
-            {
-                "currency_code": row.currency_code,
-                "rate_to_usd": row.rate_to_usd,
-                "updated_at": row.updated_at.isoformat(),
-            }
-            for row in currency_rows
-        ],
-        "system_settings": [
-            {
-                "key": row.key,
-                "value": row.value,
-                "updated_at": row.updated_at.isoformat(),
-            }
-            for row in setting_rows
-        ],
-        "sku_sequences": [
-            {
-                "sequence_key": row.sequence_key,
-                "last_value": row.last_value,
-            }
-            for row in sku_rows
-        ],
-        "product_price_history": [
-            {
-                "id": row.id,
-                "product_id": row.product_id,
-                "changed_by": row.changed_by,
-                "reason": row.reason,
-                "currency_code": row.currency_code,
-                "old_cost_amount": row.old_cost_amount,
-                "new_cost_amount": row.new_cost_amount,
-                "old_base_price_amount": row.old_base_price_amount,
-                "new_base_price_amount": row.new_base_price_amount,
-                "old_base_discount_pct": row.old_base_discount_pct,
-                "new_base_discount_pct": row.new_base_discount_pct,
-                "created_at": row.created_at.isoformat(),
-            }
-            for row in price_history_rows
-        ],
+        "id": row.id,
+        "product_id": row.product_id,
+        "quantity": row.quantity,
+        "unit_cost_usd": row.unit_cost_usd,
+        "total_usd": row.total_usd,
+        "supplier_name": row.supplier_name,
+        "purchase_note": row.purchase_note,
+        "created_by": row.created_by,
+        "created_at": row.created_at,
+    }
+
+
+def backup_product_row(row: Product) -> dict:
+    return {
+        "product_id": row.id,
+        "sku": row.sku,
+        "name": row.name,
+        "product_type": row.product_type,
+        "brand": row.brand,
+        "model": row.model,
+        "currency_code": row.currency_code,
+        "final_customer_price": row.final_customer_price,
+        "wholesale_price": row.wholesale_price,
+        "retail_price": row.retail_price,
+        "stock": row.stock,
+        "is_active": row.is_active,
+        "created_at": row.created_at,
+    }
+
+
+def backup_movement_row(row: InventoryMovement) -> dict:
+    return {
+        "id": row.id,
+        "product_id": row.product_id,
+        "movement_type": row.movement_type,
+        "quantity": row.quantity,
+        "note": row.note,
+        "created_by": row.created_by,
+        "created_at": row.created_at,
+    }
+
+
+def backup_currency_row(row: CurrencyRate) -> dict:
+    return {
+        "currency_code": row.currency_code,
+        "rate_to_usd": row.rate_to_usd,
+        "updated_at": row.updated_at,
+    }
+
+
+def backup_setting_row(row: SystemSetting) -> dict:
+    return {
+        "key": row.key,
+        "value": row.value,
+        "updated_at": row.updated_at,
+    }
+
+
+def backup_sku_row(row: SkuSequence) -> dict:
+    return {
+        "sequence_key": row.sequence_key,
+        "last_value": row.last_value,
     }
 
 
+def backup_price_history_row(row: ProductPriceHistory) -> dict:
+    return {
+        "id": row.id,
+        "product_id": row.product_id,
+        "changed_by": row.changed_by,
+        "reason": row.reason,
+        "currency_code": row.currency_code,
+        "old_cost_amount": row.old_cost_amount,
+        "new_cost_amount": row.new_cost_amount,
+        "old_base_price_amount": row.old_base_price_amount,
+        "new_base_price_amount": row.new_base_price_amount,
+        "old_base_discount_pct": row.old_base_discount_pct,
+        "new_base_discount_pct": row.new_base_discount_pct,
+        "created_at": row.created_at,
+    }
+
+
+RESTORE_FINGERPRINT_COLUMNS = {
+    "purchases": (Purchase.product_id, Purchase.quantity, Purchase.total_usd, Purchase.created_at),
+    "sales": (Sale.invoice_code, Sale.product_id, Sale.quantity, Sale.total_usd, Sale.created_at),
+    "inventory_movements": (
+        InventoryMovement.product_id,
+        InventoryMovement.movement_type,
+        InventoryMovement.quantity,
+        InventoryMovement.note,
+        InventoryMovement.created_at,
+    ),
+    "product_price_history": (
+        ProductPriceHistory.product_id,
+        ProductPriceHistory.changed_by,
+        ProductPriceHistory.reason,
+        ProductPriceHistory.new_base_price_amount,
+        ProductPriceHistory.created_at,
+    ),
+}
+PRODUCT_RESTORE_FIELDS = (
+    "name",
+    "product_type",
+    "brand",
+    "model",
+    "currency_code",
+    "final_customer_price",
+    "wholesale_price",
+    "retail_price",
+    "stock",
+    "is_active",
+)
+fingerprint_executor = ThreadPoolExecutor(max_workers=len(RESTORE_FINGERPRINT_COLUMNS))
+
+
+BACKUP_SECTIONS = (
+    ("sales", Sale, Sale.id, backup_sale_row),
+    ("purchases", Purchase, Purchase.id, backup_purchase_row),
+    ("inventory_snapshot", Product, Product.id, backup_product_row),
+    ("inventory_movements", InventoryMovement, InventoryMovement.id, backup_movement_row),
+    ("currency_rates", CurrencyRate, CurrencyRate.currency_code, backup_currency_row),
+    ("system_settings", SystemSetting, SystemSetting.key, backup_setting_row),
+    ("sku_sequences", SkuSequence, SkuSequence.sequence_key, backup_sku_row),
+    ("product_price_history", ProductPriceHistory, ProductPriceHistory.id, backup_price_history_row),
+)
+
+
+def stream_backup_section(db: Session, name: str, model, order_column, to_dict) -> Iterator[bytes]:
+    yield b',"' + name.encode() + b'":['
+    first = True
+    statement = select(model).order_by(order_column.asc()).execution_options(yield_per=BACKUP_STREAM_CHUNK)
+    for rows in db.scalars(statement).partitions():
+        chunk = b",".join(orjson.dumps(to_dict(row), option=orjson.OPT_NAIVE_UTC) for row in rows)
+        yield chunk if first else b"," + chunk
+        first = False
+    yield b"]"
+
+
+def stream_security_backup(exported_by: str) -> Iterator[bytes]:
+    with SessionLocal() as db:
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        counts = {
+            name: db.scalar(select(func.count()).select_from(model))
+            for name, model, _, _ in BACKUP_SECTIONS
+        }
+        header = {
+            "format": "ridax-backup-v2",
+            "exported_at": datetime.now(timezone.utc),
+            "exported_by": exported_by,
+            "counts": counts,
+        }
+        yield orjson.dumps(header)[:-1]
+        for name, model, order_column, to_dict in BACKUP_SECTIONS:
+            yield from stream_backup_section(db, name, model, order_column, to_dict)
+        yield b"}"
+
+
+@router.get("/security/backup")
+def export_security_backup(
+    current_user: User = Depends(require_admin("settings:view")),
+) -> StreamingResponse:
+    return StreamingResponse(stream_security_backup(current_user.email), media_type="application/json")
+
+
 @router.post("/security/restore")
-def restore_security_backup(
-    payload: dict,
+async def restore_security_backup(
+    request: Request,
     replace_data: bool = True,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_permission("settings:write")),
+    current_user: User = Depends(require_admin("settings:write")),
 ) -> dict:
-    ensure_admin_user(db, current_user)
+    try:
+        payload = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as exc:
+        raise HTTPException(status_code=400, detail="Respaldo JSON invalido") from exc
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Formato de respaldo invalido")
+    return await run_in_threadpool(apply_security_backup, db, current_user, payload, replace_data)
 
+
+def apply_security_backup(db: Session, current_user: User, payload: dict, replace_data: bool) -> dict:
+    restored_at = datetime.now(timezone.utc)
     backup_format = str(payload.get("format") or "")
     if backup_format not in {"ridax-backup-v1", "ridax-backup-v2"}:
         raise HTTPException(status_code=400, detail="Formato de respaldo invalido")
@@ -612,6 +810,15 @@ def restore_security_backup(
     ):
         raise HTTPException(status_code=400, detail="Estructura de respaldo invalida")
 
+    fingerprint_futures = (
+        {}
+        if replace_data
+        else {
+            name: fingerprint_executor.submit(load_fingerprints_in_new_session, columns)
+            for name, columns in RESTORE_FINGERPRINT_COLUMNS.items()
+        }
+    )
+
     if replace_data:
         db.execute(delete(ProductPriceHistory))
         db.execute(delete(Purchase))
@@ -621,13 +828,13 @@ def restore_security_backup(
             db.execute(delete(CurrencyRate))
             db.execute(delete(SystemSetting))
             db.execute(delete(SkuSequence))
-        db.commit()
 
     updated_currency_rates = 0
     updated_system_settings = 0
     updated_sku_sequences = 0
 
     if backup_format == "ridax-backup-v2":
+        currency_values: dict[str, dict] = {}
         for item in currency_data:
             if not isinstance(item, dict):
                 continue
@@ -637,31 +844,44 @@ def restore_security_backup(
             rate_value = item.get("rate_to_usd")
             if not isinstance(rate_value, (int, float)):
                 continue
-            row = db.scalar(select(CurrencyRate).where(CurrencyRate.currency_code == code))
-            if not row:
-                row = CurrencyRate(currency_code=code, rate_to_usd=float(rate_value))
-                db.add(row)
-            else:
-                row.rate_to_usd = float(rate_value)
-            row.updated_at = parse_iso_datetime(str(item.get("updated_at") or ""))
+            currency_values[code] = {
+                "currency_code": code,
+                "rate_to_usd": float(rate_value),
+                "updated_at": parse_iso_datetime(str(item.get("updated_at") or ""), restored_at),
+            }
             updated_currency_rates += 1
+        if currency_values:
+            statement = pg_insert(CurrencyRate).values(list(currency_values.values()))
+            db.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[CurrencyRate.currency_code],
+                    set_={"rate_to_usd": statement.excluded.rate_to_usd, "updated_at": statement.excluded.updated_at},
+                )
+            )
 
+        setting_values: dict[str, dict] = {}
         for item in settings_data:
             if not isinstance(item, dict):
                 continue
             key = str(item.get("key") or "").strip()
             if not key:
                 continue
-            value = str(item.get("value") or "")
-            row = db.scalar(select(SystemSetting).where(SystemSetting.key == key))
-            if not row:
-                row = SystemSetting(key=key, value=value)
-                db.add(row)
-            else:
-                row.value = value
-            row.updated_at = parse_iso_datetime(str(item.get("updated_at") or ""))
+            setting_values[key] = {
+                "key": key,
+                "value": str(item.get("value") or ""),
+                "updated_at": parse_iso_datetime(str(item.get("updated_at") or ""), restored_at),
+            }
             updated_system_settings += 1
+        if setting_values:
+            statement = pg_insert(SystemSetting).values(list(setting_values.values()))
+            db.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[SystemSetting.key],
+                    set_={"value": statement.excluded.value, "updated_at": statement.excluded.updated_at},
+                )
+            )
 
+        sequence_values: dict[str, dict] = {}
         for item in sku_data:
             if not isinstance(item, dict):
                 continue
@@ -671,88 +891,102 @@ def restore_security_backup(
             last_value = item.get("last_value")
             if not isinstance(last_value, int):
                 continue
-            row = db.scalar(select(SkuSequence).where(SkuSequence.sequence_key == sequence_key))
-            if not row:
-                row = SkuSequence(sequence_key=sequence_key, last_value=last_value)
-                db.add(row)
-            else:
-                row.last_value = last_value
+            sequence_values[sequence_key] = {"sequence_key": sequence_key, "last_value": last_value}
             updated_sku_sequences += 1
+        if sequence_values:
+            statement = pg_insert(SkuSequence).values(list(sequence_values.values()))
+            db.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[SkuSequence.sequence_key],
+                    set_={"last_value": statement.excluded.last_value},
+                )
+            )
 
-        usd_rate = db.scalar(select(CurrencyRate).where(CurrencyRate.currency_code == "USD"))
-        if not usd_rate:
-            db.add(CurrencyRate(currency_code="USD", rate_to_usd=1.0))
+        db.execute(
+            pg_insert(CurrencyRate)
+            .values(currency_code="USD", rate_to_usd=1.0, updated_at=restored_at)
+            .on_conflict_do_nothing(index_elements=[CurrencyRate.currency_code])
+        )
 
     product_rows = db.scalars(select(Product)).all()
     products_by_id = {row.id: row for row in product_rows}
     products_by_sku = {row.sku: row for row in product_rows}
+    pending_by_id: dict[int, dict] = {}
+    pending_by_sku: dict[str, dict] = {}
+    pending_links: list[tuple[int, str]] = []
     product_id_map: dict[int, int] = {}
 
     updated_products = 0
     for item in inventory_data:
         if not isinstance(item, dict):
             continue
-        product = None
         product_id = item.get("product_id")
-        if isinstance(product_id, int):
-            product = products_by_id.get(product_id)
-        if not product and item.get("sku"):
-            product = products_by_sku.get(str(item.get("sku")))
-        if not product:
-            sku = str(item.get("sku") or "").strip()
+        sku = str(item.get("sku") or "")
+        product = products_by_id.get(product_id) if isinstance(product_id, int) else None
+        pending = pending_by_id.get(product_id) if isinstance(product_id, int) and not product else None
+        if not product and not pending and sku:
+            product = products_by_sku.get(sku)
+            pending = pending_by_sku.get(sku) if not product else None
+        updates = backup_product_updates(item)
+
+        if product:
+            for field, value in updates.items():
+                setattr(product, field, value)
+            if isinstance(product_id, int):
+                product_id_map[product_id] = product.id
+        elif pending:
+            pending.update(updates)
+            if isinstance(product_id, int):
+                pending_links.append((product_id, pending["sku"]))
+        else:
+            sku = sku.strip()
             name = str(item.get("name") or "").strip()
             if not sku or not name:
                 continue
-            product = Product(
-                sku=sku,
-                name=name,
-                product_type=str(item.get("product_type") or ""),
-                brand=str(item.get("brand") or ""),
-                model=str(item.get("model") or ""),
-                currency_code=str(item.get("currency_code") or "USD").upper(),
-                final_customer_price=float(item.get("final_customer_price") or 0),
-                wholesale_price=float(item.get("wholesale_price") or 0),
-                retail_price=float(item.get("retail_price") or 0),
-                base_price_amount=float(item.get("retail_price") or 0),
-                price_usd=float(item.get("final_customer_price") or 0),
-                stock=int(item.get("stock") or 0),
-                is_active=bool(item.get("is_active", True)),
-            )
-            if isinstance(product_id, int) and product_id > 0 and product_id not in products_by_id:
-                product.id = product_id
-            db.add(product)
-            db.flush()
-            products_by_id[product.id] = product
-            products_by_sku[product.sku] = product
-
-        if isinstance(product_id, int):
-            product_id_map[product_id] = product.id
-
-        stock_value = item.get("stock")
-        if isinstance(stock_value, (int, float)):
-            product.stock = int(stock_value)
-        if isinstance(item.get("product_type"), str):
-            product.product_type = item["product_type"]
-        if isinstance(item.get("brand"), str):
-            product.brand = item["brand"]
-        if isinstance(item.get("model"), str):
-            product.model = item["model"]
-        if isinstance(item.get("currency_code"), str):
-            product.currency_code = item["currency_code"].upper()
-        if isinstance(item.get("wholesale_price"), (int, float)):
-            product.wholesale_price = float(item["wholesale_price"])
-        if isinstance(item.get("retail_price"), (int, float)):
-            product.retail_price = float(item["retail_price"])
-        if isinstance(item.get("final_customer_price"), (int, float)):
-            product.final_customer_price = float(item["final_customer_price"])
-        if isinstance(item.get("is_active"), bool):
-            product.is_active = item["is_active"]
+            pending = {
+                "sku": sku,
+                "name": name,
+                "product_type": str(item.get("product_type") or ""),
+                "brand": str(item.get("brand") or ""),
+                "model": str(item.get("model") or ""),
+                "currency_code": normalize_currency_code(item.get("currency_code")),
+                "final_customer_price": float(item.get("final_customer_price") or 0),
+                "wholesale_price": float(item.get("wholesale_price") or 0),
+                "retail_price": float(item.get("retail_price") or 0),
+                "base_price_amount": float(item.get("retail_price") or 0),
+                "price_usd": float(item.get("final_customer_price") or 0),
+                "stock": int(item.get("stock") or 0),
+                "is_active": bool(item.get("is_active", True)),
+            }
+            pending.update(updates)
+            if isinstance(product_id, int) and product_id > 0:
+                pending["id"] = product_id
+                pending_by_id[product_id] = pending
+            pending_by_sku[sku] = pending
+            if isinstance(product_id, int):
+                pending_links.append((product_id, sku))
         updated_products += 1
 
-    existing_purchase_fingerprints = {
-        f"{row.product_id}:{row.quantity}:{row.total_usd}:{row.created_at.isoformat()}"
-        for row in db.scalars(select(Purchase)).all()
-    }
+    known_product_ids = set(products_by_id)
+    if pending_by_sku:
+        created_ids: dict[str, int] = {}
+        with_id = [row for row in pending_by_sku.values() if "id" in row]
+        without_id = [row for row in pending_by_sku.values() if "id" not in row]
+        for rows in (with_id, without_id):
+            if not rows:
+                continue
+            statement = pg_insert(Product).values(rows)
+            statement = statement.on_conflict_do_update(
+                index_elements=[Product.sku],
+                set_={field: statement.excluded[field] for field in PRODUCT_RESTORE_FIELDS},
+            ).returning(Product.sku, Product.id)
+            created_ids.update(db.execute(statement).tuples().all())
+        known_product_ids.update(created_ids.values())
+        for old_id, sku in pending_links:
+            product_id_map[old_id] = created_ids[sku]
+
+    existing_purchase_fingerprints = fingerprint_futures["purchases"].result() if fingerprint_futures else set()
+    purchase_rows: list[dict] = []
     added_purchases = 0
     for item in purchases_data:
         if not isinstance(item, dict):
@@ -761,100 +995,107 @@ def restore_security_backup(
         if not isinstance(old_product_id, int):
             continue
         product_id = product_id_map.get(old_product_id, old_product_id)
-        if product_id not in products_by_id:
+        if product_id not in known_product_ids:
             continue
-        created_at_raw = str(item.get("created_at") or "")
-        fingerprint = (
-            f"{product_id}:{int(item.get('quantity') or 0)}:{float(item.get('total_usd') or 0)}:{created_at_raw}"
-        )
-        if not replace_data and fingerprint in existing_purchase_fingerprints:
+        created_at = parse_iso_datetime(str(item.get("created_at") or ""), restored_at)
+        if existing_purchase_fingerprints and (
+            hash((product_id, int(item.get("quantity") or 0), round(float(item.get("total_usd") or 0), 4), created_at))
+            in existing_purchase_fingerprints
+        ):
             continue
 
-        db.add(
-            Purchase(
-                product_id=product_id,
-                quantity=max(1, int(item.get("quantity") or 1)),
-                unit_cost_usd=float(item.get("unit_cost_usd") or 0),
-                total_usd=float(item.get("total_usd") or 0),
-                supplier_name=str(item.get("supplier_name") or ""),
-                purchase_note=str(item.get("purchase_note") or ""),
-                created_by=int(item.get("created_by") or current_user.id),
-                created_at=parse_iso_datetime(created_at_raw),
-            )
+        purchase_rows.append(
+            {
+                "product_id": product_id,
+                "quantity": max(1, int(item.get("quantity") or 1)),
+                "unit_cost_usd": float(item.get("unit_cost_usd") or 0),
+                "total_usd": float(item.get("total_usd") or 0),
+                "supplier_name": str(item.get("supplier_name") or ""),
+                "purchase_note": str(item.get("purchase_note") or ""),
+                "created_by": int(item.get("created_by") or current_user.id),
+                "created_at": created_at,
+            }
         )
         added_purchases += 1
+    if purchase_rows:
+        db.execute(
+            insert(Purchase).execution_options(insertmanyvalues_page_size=NARROW_INSERT_PAGE_SIZE),
+            purchase_rows,
+        )
 
-    existing_fingerprints = {
-        f"{row.invoice_code}:{row.product_id}:{row.quantity}:{row.total_usd}:{row.created_at.isoformat()}"
-        for row in db.scalars(select(Sale)).all()
-    }
+    existing_fingerprints = fingerprint_futures["sales"].result() if fingerprint_futures else set()
+    sale_rows: list[dict] = []
+    fallback_invoice_numbers = itertools.count(1)
     added_sales = 0
     for item in sales_data:
         if not isinstance(item, dict):
             continue
+        created_at = parse_iso_datetime(str(item.get("created_at") or ""), restored_at)
         try:
             fingerprint = (
-                f"{item.get('invoice_code')}:{int(item.get('product_id', 0))}:"
-                f"{int(item.get('quantity', 0))}:{float(item.get('total_usd', 0))}:"
-                f"{str(item.get('created_at') or '')}"
+                str(item.get("invoice_code")),
+                int(item.get("product_id", 0)),
+                int(item.get("quantity", 0)),
+                round(float(item.get("total_usd", 0)), 4),
+                created_at,
             )
         except (TypeError, ValueError):
             continue
 
-        if not replace_data and fingerprint in existing_fingerprints:
+        if existing_fingerprints and hash(fingerprint) in existing_fingerprints:
             continue
 
         old_product_id = item.get("product_id")
         if not isinstance(old_product_id, int):
             continue
         product_id = product_id_map.get(old_product_id, old_product_id)
-        if product_id not in products_by_id:
+        if product_id not in known_product_ids:
             continue
 
-        db.add(
-            Sale(
-                invoice_code=str(item.get("invoice_code") or f"REST-{datetime.now(timezone.utc).timestamp()}"),
-                product_id=product_id,
-                quantity=max(1, int(item.get("quantity") or 1)),
-                currency_code=str(item.get("currency_code") or "USD").upper(),
-                unit_price_usd=float(item.get("unit_price_usd") or 0),
-                subtotal_usd=float(item.get("subtotal_usd") or 0),
-                discount_pct=float(item.get("discount_pct") or 0),
-                discount_amount_usd=float(item.get("discount_amount_usd") or 0),
-                tax_pct=float(item.get("tax_pct") or 0),
-                tax_amount_usd=float(item.get("tax_amount_usd") or 0),
-                total_usd=float(item.get("total_usd") or 0),
-                customer_name=str(item.get("customer_name") or ""),
-                customer_phone=str(item.get("customer_phone") or ""),
-                customer_address=str(item.get("customer_address") or ""),
-                customer_rif=str(item.get("customer_rif") or ""),
-                seller_user_id=int(item.get("seller_user_id")) if item.get("seller_user_id") is not None else None,
-                sale_date=parse_iso_datetime(str(item.get("sale_date") or "")) if item.get("sale_date") else None,
-                payment_currency_code=str(item.get("payment_currency_code") or "USD").upper(),
-                payment_amount=float(item.get("payment_amount") or 0),
-                payment_rate_to_usd=float(item.get("payment_rate_to_usd") or 0),
-                payment_amount_usd=float(item.get("payment_amount_usd") or 0),
-                manual_total_override=bool(item.get("manual_total_override", False)),
-                manual_total_input_usd=float(item.get("manual_total_input_usd")) if item.get("manual_total_input_usd") is not None else None,
-                manual_total_original_usd=float(item.get("manual_total_original_usd")) if item.get("manual_total_original_usd") is not None else None,
-                manual_total_set_by=int(item.get("manual_total_set_by")) if item.get("manual_total_set_by") is not None else None,
-                manual_total_set_at=parse_iso_datetime(str(item.get("manual_total_set_at") or "")) if item.get("manual_total_set_at") else None,
-                commission_pct=float(item.get("commission_pct") or 0),
-                commission_amount_usd=float(item.get("commission_amount_usd") or 0),
-                is_voided=bool(item.get("is_voided", False)),
-                voided_at=parse_iso_datetime(str(item.get("voided_at") or "")) if item.get("voided_at") else None,
-                voided_by=int(item.get("voided_by")) if item.get("voided_by") is not None else None,
-                void_reason=str(item.get("void_reason") or ""),
-                created_by=int(item.get("created_by") or current_user.id),
-                created_at=parse_iso_datetime(str(item.get("created_at") or "")),
-            )
+        sale_rows.append(
+            {
+                "invoice_code": str(item.get("invoice_code") or f"REST-{restored_at.timestamp()}-{next(fallback_invoice_numbers)}"),
+                "product_id": product_id,
+                "quantity": max(1, int(item.get("quantity") or 1)),
+                "currency_code": normalize_currency_code(item.get("currency_code")),
+                "unit_price_usd": float(item.get("unit_price_usd") or 0),
+                "subtotal_usd": float(item.get("subtotal_usd") or 0),
+                "discount_pct": float(item.get("discount_pct") or 0),
+                "discount_amount_usd": float(item.get("discount_amount_usd") or 0),
+                "tax_pct": float(item.get("tax_pct") or 0),
+                "tax_amount_usd": float(item.get("tax_amount_usd") or 0),
+                "total_usd": float(item.get("total_usd") or 0),
+                "customer_name": str(item.get("customer_name") or ""),
+                "customer_phone": str(item.get("customer_phone") or ""),
+                "customer_address": str(item.get("customer_address") or ""),
+                "customer_rif": str(item.get("customer_rif") or ""),
+                "seller_user_id": int(item.get("seller_user_id")) if item.get("seller_user_id") is not None else None,
+                "sale_date": parse_iso_datetime(str(item.get("sale_date") or ""), restored_at) if item.get("sale_date") else None,
+                "payment_currency_code": normalize_currency_code(item.get("payment_currency_code")),
+                "payment_amount": float(item.get("payment_amount") or 0),
+                "payment_rate_to_usd": float(item.get("payment_rate_to_usd") or 0),
+                "payment_amount_usd": float(item.get("payment_amount_usd") or 0),
+                "manual_total_override": bool(item.get("manual_total_override", False)),
+                "manual_total_input_usd": float(item.get("manual_total_input_usd")) if item.get("manual_total_input_usd") is not None else None,
+                "manual_total_original_usd": float(item.get("manual_total_original_usd")) if item.get("manual_total_original_usd") is not None else None,
+                "manual_total_set_by": int(item.get("manual_total_set_by")) if item.get("manual_total_set_by") is not None else None,
+                "manual_total_set_at": parse_iso_datetime(str(item.get("manual_total_set_at") or ""), restored_at) if item.get("manual_total_set_at") else None,
+                "commission_pct": float(item.get("commission_pct") or 0),
+                "commission_amount_usd": float(item.get("commission_amount_usd") or 0),
+                "is_voided": bool(item.get("is_voided", False)),
+                "voided_at": parse_iso_datetime(str(item.get("voided_at") or ""), restored_at) if item.get("voided_at") else None,
+                "voided_by": int(item.get("voided_by")) if item.get("voided_by") is not None else None,
+                "void_reason": str(item.get("void_reason") or ""),
+                "created_by": int(item.get("created_by") or current_user.id),
+                "created_at": created_at,
+            }
         )
         added_sales += 1
+    if sale_rows:
+        db.execute(insert(Sale), sale_rows)
 
-    existing_movements = {
-        f"{row.product_id}:{row.movement_type}:{row.quantity}:{row.note}:{row.created_at.isoformat()}"
-        for row in db.scalars(select(InventoryMovement)).all()
-    }
+    existing_movements = fingerprint_futures["inventory_movements"].result() if fingerprint_futures else set()
+    movement_rows: list[dict] = []
     added_movements = 0
     for item in movement_data:
         if not isinstance(item, dict):
@@ -863,33 +1104,35 @@ def restore_security_backup(
         if not isinstance(old_product_id, int):
             continue
         product_id = product_id_map.get(old_product_id, old_product_id)
-        if product_id not in products_by_id:
+        if product_id not in known_product_ids:
             continue
 
         movement_type = str(item.get("movement_type") or "adjustment_in")
         quantity = int(item.get("quantity") or 0)
         note = str(item.get("note") or "")
-        created_at_raw = str(item.get("created_at") or "")
-        fingerprint = f"{product_id}:{movement_type}:{quantity}:{note}:{created_at_raw}"
-        if not replace_data and fingerprint in existing_movements:
+        created_at = parse_iso_datetime(str(item.get("created_at") or ""), restored_at)
+        if existing_movements and hash((product_id, movement_type, quantity, note, created_at)) in existing_movements:
             continue
 
-        db.add(
-            InventoryMovement(
-                product_id=product_id,
-                movement_type=movement_type,
-                quantity=quantity,
-                note=note,
-                created_by=int(item.get("created_by") or current_user.id),
-                created_at=parse_iso_datetime(created_at_raw),
-            )
+        movement_rows.append(
+            {
+                "product_id": product_id,
+                "movement_type": movement_type,
+                "quantity": quantity,
+                "note": note,
+                "created_by": int(item.get("created_by") or current_user.id),
+                "created_at": created_at,
+            }
         )
         added_movements += 1
+    if movement_rows:
+        db.execute(
+            insert(InventoryMovement).execution_options(insertmanyvalues_page_size=NARROW_INSERT_PAGE_SIZE),
+            movement_rows,
+        )
 
-    existing_history_fingerprints = {
-        f"{row.product_id}:{row.changed_by}:{row.reason}:{row.new_base_price_amount}:{row.created_at.isoformat()}"
-        for row in db.scalars(select(ProductPriceHistory)).all()
-    }
+    existing_history_fingerprints = fingerprint_futures["product_price_history"].result() if fingerprint_futures else set()
+    price_history_rows: list[dict] = []
     added_price_history = 0
     for item in price_history_data:
         if not isinstance(item, dict):
@@ -898,35 +1141,51 @@ def restore_security_backup(
         if not isinstance(old_product_id, int):
             continue
         product_id = product_id_map.get(old_product_id, old_product_id)
-        if product_id not in products_by_id:
+        if product_id not in known_product_ids:
             continue
 
-        created_at_raw = str(item.get("created_at") or "")
-        fingerprint = (
-            f"{product_id}:{int(item.get('changed_by') or current_user.id)}:{str(item.get('reason') or '')}:"
-            f"{float(item.get('new_base_price_amount') or 0)}:{created_at_raw}"
-        )
-        if not replace_data and fingerprint in existing_history_fingerprints:
+        created_at = parse_iso_datetime(str(item.get("created_at") or ""), restored_at)
+        if existing_history_fingerprints and (
+            hash(
+                (
+                    product_id,
+                    int(item.get("changed_by") or current_user.id),
+                    str(item.get("reason") or ""),
+                    round(float(item.get("new_base_price_amount") or 0), 4),
+                    created_at,
+                )
+            )
+            in existing_history_fingerprints
+        ):
             continue
 
-        db.add(
-            ProductPriceHistory(
-                product_id=product_id,
-                changed_by=int(item.get("changed_by") or current_user.id),
-                reason=str(item.get("reason") or ""),
-                currency_code=str(item.get("currency_code") or "USD").upper(),
-                old_cost_amount=float(item.get("old_cost_amount") or 0),
-                new_cost_amount=float(item.get("new_cost_amount") or 0),
-                old_base_price_amount=float(item.get("old_base_price_amount") or 0),
-                new_base_price_amount=float(item.get("new_base_price_amount") or 0),
-                old_base_discount_pct=float(item.get("old_base_discount_pct") or 0),
-                new_base_discount_pct=float(item.get("new_base_discount_pct") or 0),
-                created_at=parse_iso_datetime(created_at_raw),
-            )
+        price_history_rows.append(
+            {
+                "product_id": product_id,
+                "changed_by": int(item.get("changed_by") or current_user.id),
+                "reason": str(item.get("reason") or ""),
+                "currency_code": normalize_currency_code(item.get("currency_code")),
+                "old_cost_amount": float(item.get("old_cost_amount") or 0),
+                "new_cost_amount": float(item.get("new_cost_amount") or 0),
+                "old_base_price_amount": float(item.get("old_base_price_amount") or 0),
+                "new_base_price_amount": float(item.get("new_base_price_amount") or 0),
+                "old_base_discount_pct": float(item.get("old_base_discount_pct") or 0),
+                "new_base_discount_pct": float(item.get("new_base_discount_pct") or 0),
+                "created_at": created_at,
+            }
         )
         added_price_history += 1
+    if price_history_rows:
+        db.execute(
+            insert(ProductPriceHistory).execution_options(insertmanyvalues_page_size=NARROW_INSERT_PAGE_SIZE),
+            price_history_rows,
+        )
 
     db.commit()
+    parse_cached_iso_datetime.cache_clear()
+    invalidate_settings_cache()
+    invalidate_rate_cache()
+    invalidate_cached(GENERAL_CACHE_KEY, CURRENCIES_CACHE_KEY)
     return {
         "message": "Respaldo restaurado",
         "replace_data": replace_data,
@@ -14,6 +14,8 @@ class Settings(BaseSettings):
     frontend_url: str = "http://localhost:3000"
 
     database_url: str = "postgresql+psycopg2://ridax:ridax@db:5432/ridax"
+    database_search_path: str = "public"
+    redis_url: str = "redis://redis:6379/0"
     cors_origins: str = "http://localhost:3000"
 
     telegram_bot_token: str = ""
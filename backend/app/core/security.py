@@ -7,7 +7,9 @@ from passlib.context import CryptContext
 from app.core.config import get_settings
 
 
+settings = get_settings()
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+JWT_ALGORITHM = "HS256"
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -19,16 +21,14 @@ def hash_password(password: str) -> str:
 
 
 def create_access_token(subject: str, token_version: int = 0, expires_delta: int | None = None) -> str:
-    settings = get_settings()
     expire_minutes = expires_delta if expires_delta else settings.access_token_expire_minutes
     expire = datetime.now(timezone.utc) + timedelta(minutes=expire_minutes)
     to_encode: dict[str, Any] = {"sub": subject, "ver": token_version, "exp": expire}
-    return jwt.encode(to_encode, settings.secret_key, algorithm="HS256")
+    return jwt.encode(to_encode, settings.secret_key, algorithm=JWT_ALGORITHM)
 
 
 def decode_access_token(token: str) -> dict[str, Any] | None:
-    settings = get_settings()
     try:
-        return jwt.decode(token, settings.secret_key, algorithms=["HS256"])
+        return jwt.decode(token, settings.secret_key, algorithms=[JWT_ALGORITHM])
     except JWTError:
         return None
@@ -1,5 +1,9 @@
+from sqlalchemy import Numeric
 from sqlalchemy.orm import DeclarativeBase
 
 
+MONEY = Numeric(18, 4, asdecimal=False)
+
+
 class Base(DeclarativeBase):
     pass
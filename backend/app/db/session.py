@@ -1,26 +1,40 @@
-from sqlalchemy import create_engine, event
+from sqlalchemy import Engine, create_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
 from app.core.config import get_settings
 
 
 settings = get_settings()
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+CONNECT_ARGS = {"options": f"-csearch_path={settings.database_search_path}"} if settings.database_search_path else {}
+engine = create_engine(
+    settings.database_url,
+    pool_pre_ping=True,
+    pool_size=20,
+    max_overflow=40,
+    pool_recycle=1800,
+    isolation_level="READ COMMITTED",
+    executemany_mode="values_plus_batch",
+    insertmanyvalues_page_size=500,
+    executemany_batch_page_size=500,
+    connect_args=CONNECT_ARGS,
+)
 
 
-@event.listens_for(engine, "connect")
-def set_search_path(dbapi_connection, _connection_record) -> None:
-    cursor = dbapi_connection.cursor()
-    cursor.execute("SET search_path TO public")
-    cursor.close()
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def create_ddl_engine() -> Engine:
+    return create_engine(settings.database_url, poolclass=NullPool, connect_args=CONNECT_ARGS)
 
 
 def get_db() -> Session:
     db = SessionLocal()
     try:
         yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
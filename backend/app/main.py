@@ -1,65 +1,141 @@
-import time
+import asyncio
+import random
 
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import inspect, text
-from sqlalchemy.exc import OperationalError
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import Column, DateTime, Engine, Numeric, inspect, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import OperationalError, ProgrammingError
 
 from app.api.routes import api_router
 from app.core.config import get_settings
 from app.db.base import Base
-from app.db.session import SessionLocal, engine
+from app.db.session import SessionLocal, create_ddl_engine, engine
+from app.models.system_setting import SystemSetting
+from app.services.http_client import close_http_client
 from app.services.seed import seed_initial_data
 
 
 settings = get_settings()
-app = FastAPI(title=settings.app_name)
+app = FastAPI(title=settings.app_name, default_response_class=ORJSONResponse)
+DB_READY_MAX_ATTEMPTS = 20
+RUNTIME_SCHEMA_VERSION = "8"
+RUNTIME_SCHEMA_VERSION_KEY = "schema_runtime_patch_version"
+SALES_COLUMN_DDL = {
+    "seller_user_id": "INTEGER",
+    "sale_date": "TIMESTAMP WITH TIME ZONE",
+    "payment_currency_code": "VARCHAR(10)",
+    "payment_amount": "NUMERIC(18, 4)",
+    "payment_rate_to_usd": "DOUBLE PRECISION",
+    "payment_amount_usd": "NUMERIC(18, 4)",
+    "manual_total_override": "BOOLEAN DEFAULT FALSE",
+    "manual_total_input_usd": "NUMERIC(18, 4)",
+    "manual_total_original_usd": "NUMERIC(18, 4)",
+    "manual_total_set_by": "INTEGER",
+    "manual_total_set_at": "TIMESTAMP WITH TIME ZONE",
+    "commission_pct": "DOUBLE PRECISION DEFAULT 0",
+    "commission_amount_usd": "NUMERIC(18, 4) DEFAULT 0",
+    "is_voided": "BOOLEAN DEFAULT FALSE",
+    "voided_at": "TIMESTAMP WITH TIME ZONE",
+    "voided_by": "INTEGER",
+    "void_reason": "VARCHAR(255) DEFAULT ''",
+}
+SALES_INDEX_DDL = (
+    "CREATE INDEX IF NOT EXISTS ix_sales_invoice_voided ON sales (invoice_code, is_voided)",
+    "CREATE INDEX IF NOT EXISTS ix_sales_created_at ON sales (created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_sales_effective_date ON sales (coalesce(sale_date, created_at))",
+)
+REDUNDANT_UNIQUE_DDL = (
+    "DROP INDEX IF EXISTS ix_system_settings_key",
+    "ALTER TABLE system_settings DROP CONSTRAINT IF EXISTS system_settings_key_key",
+    "DROP INDEX IF EXISTS ix_currency_rates_currency_code",
+    "ALTER TABLE currency_rates DROP CONSTRAINT IF EXISTS currency_rates_currency_code_key",
+)
+
 
+def runtime_schema_current(bind: Engine) -> bool:
+    try:
+        with bind.connect() as conn:
+            applied_version = conn.scalar(
+                select(SystemSetting.value).where(SystemSetting.key == RUNTIME_SCHEMA_VERSION_KEY)
+            )
+    except ProgrammingError:
+        return False
+    return applied_version == RUNTIME_SCHEMA_VERSION
+
+
+def is_money_column(column: Column) -> bool:
+    return isinstance(column.type, Numeric) and (column.type.precision, column.type.scale) == (18, 4)
+
+
+def apply_runtime_schema_updates(bind: Engine) -> None:
+    inspector = inspect(bind)
+    sales_columns = {column["name"] for column in inspector.get_multi_columns(filter_names=["sales"])[(None, "sales")]}
+    index_names = {
+        index["name"]
+        for table_indexes in inspector.get_multi_indexes(filter_names=["system_settings", "currency_rates"]).values()
+        for index in table_indexes
+    }
+    sales_clauses = [f"ADD COLUMN {name} {ddl}" for name, ddl in SALES_COLUMN_DDL.items() if name not in sales_columns]
 
-def apply_runtime_schema_updates() -> None:
-    sales_columns = {column["name"] for column in inspect(engine).get_columns("sales")}
     statements: list[str] = []
-    if "seller_user_id" not in sales_columns:
-        statements.append("ALTER TABLE sales ADD COLUMN seller_user_id INTEGER")
-    if "sale_date" not in sales_columns:
-        statements.append("ALTER TABLE sales ADD COLUMN sale_date TIMESTAMP WITH TIME ZONE")
-    if "payment_currency_code" not in sales_columns:
-        statements.append("ALTER TABLE sales ADD COLUMN payment_currency_code VARCHAR(10)")
-    if "payment_amount" not in sales_columns:
-        statements.append("ALTER TABLE sales ADD COLUMN payment_amount DOUBLE PRECISION")
-    if "payment_rate_to_usd" not in sales_columns:
-        statements.append("ALTER TABLE sales ADD COLUMN payment_rate_to_usd DOUBLE PRECISION")
-    if "payment_amount_usd" not in sales_columns:
-        statements.append("ALTER TABLE sales ADD COLUMN payment_amount_usd DOUBLE PRECISION")
-    if "manual_total_override" not in sales_columns:
-        statements.append("ALTER TABLE sales ADD COLUMN manual_total_override BOOLEAN DEFAULT FALSE")
-    if "manual_total_input_usd" not in sales_columns:
-        statements.append("ALTER TABLE sales ADD COLUMN manual_total_input_usd DOUBLE PRECISION")
-    if "manual_total_original_usd" not in sales_columns:
-        statements.append("ALTER TABLE sales ADD COLUMN manual_total_original_usd DOUBLE PRECISION")
-    if "manual_total_set_by" not in sales_columns:
-        statements.append("ALTER TABLE sales ADD COLUMN manual_total_set_by INTEGER")
-    if "manual_total_set_at" not in sales_columns:
-        statements.append("ALTER TABLE sales ADD COLUMN manual_total_set_at TIMESTAMP WITH TIME ZONE")
-    if "commission_pct" not in sales_columns:
-        statements.append("ALTER TABLE sales ADD COLUMN commission_pct DOUBLE PRECISION DEFAULT 0")
-    if "commission_amount_usd" not in sales_columns:
-        statements.append("ALTER TABLE sales ADD COLUMN commission_amount_usd DOUBLE PRECISION DEFAULT 0")
-    if "is_voided" not in sales_columns:
-        statements.append("ALTER TABLE sales ADD COLUMN is_voided BOOLEAN DEFAULT FALSE")
-    if "voided_at" not in sales_columns:
-        statements.append("ALTER TABLE sales ADD COLUMN voided_at TIMESTAMP WITH TIME ZONE")
-    if "voided_by" not in sales_columns:
-        statements.append("ALTER TABLE sales ADD COLUMN voided_by INTEGER")
-    if "void_reason" not in sales_columns:
-        statements.append("ALTER TABLE sales ADD COLUMN void_reason VARCHAR(255) DEFAULT ''")
-
-    if not statements:
-        return
-
-    with engine.begin() as conn:
+    if sales_clauses:
+        statements.append("ALTER TABLE sales " + ", ".join(sales_clauses))
+    statements.extend(SALES_INDEX_DDL)
+    statements.extend(f"DROP INDEX IF EXISTS ix_{table}_id" for table in Base.metadata.tables)
+    statements.append("ALTER TABLE products ALTER COLUMN description TYPE TEXT")
+    for table in Base.metadata.tables.values():
+        money_clauses = [
+            f"ALTER COLUMN {column.name} TYPE NUMERIC(18, 4)" for column in table.columns if is_money_column(column)
+        ]
+        if money_clauses:
+            statements.append(f"ALTER TABLE {table.name} " + ", ".join(money_clauses))
+    statements.extend(
+        f"ALTER TABLE {table.name} ALTER COLUMN {column.name} SET DEFAULT now()"
+        for table in Base.metadata.tables.values()
+        for column in table.columns
+        if column.server_default is not None and isinstance(column.type, DateTime)
+    )
+
+    if "ix_system_settings_key_covering" not in index_names:
+        statements.append(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_system_settings_key_covering "
+            "ON system_settings (key) INCLUDE (value, updated_at)"
+        )
+    if "ix_currency_rates_code_covering" not in index_names:
+        statements.append(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_currency_rates_code_covering "
+            "ON currency_rates (currency_code) INCLUDE (rate_to_usd, updated_at)"
+        )
+    statements.extend(REDUNDANT_UNIQUE_DDL)
+
+    marker = pg_insert(SystemSetting).values(key=RUNTIME_SCHEMA_VERSION_KEY, value=RUNTIME_SCHEMA_VERSION)
+    with bind.begin() as conn:
         for statement in statements:
             conn.execute(text(statement))
+        conn.execute(
+            marker.on_conflict_do_update(
+                index_elements=[SystemSetting.key],
+                set_={"value": marker.excluded.value, "updated_at": marker.excluded.updated_at},
+            )
+        )
+
+
+def warm_connection_pool() -> None:
+    connections = []
+    try:
+        for _ in range(engine.pool.size()):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.execute(text("SELECT 1"))
+    except OperationalError:
+        pass
+    finally:
+        for connection in connections:
+            connection.close()
+
 
 origins = [origin.strip() for origin in settings.cors_origins.split(",") if origin.strip()]
 app.add_middleware(
@@ -71,25 +147,45 @@ app.add_middleware(
 )
 
 
+def ping_database() -> None:
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+def initialize_schema() -> None:
+    ddl_engine = create_ddl_engine()
+    try:
+        if not runtime_schema_current(ddl_engine):
+            Base.metadata.create_all(bind=ddl_engine)
+            apply_runtime_schema_updates(ddl_engine)
+    finally:
+        ddl_engine.dispose()
+
+
+def seed_database() -> None:
+    with SessionLocal() as db, db.begin():
+        seed_initial_data(db)
+
+
 @app.on_event("startup")
-def startup_event() -> None:
-    retries = 20
-    while retries > 0:
+async def startup_event() -> None:
+    for attempt in range(DB_READY_MAX_ATTEMPTS):
         try:
-            Base.metadata.create_all(bind=engine)
-            apply_runtime_schema_updates()
+            await run_in_threadpool(ping_database)
             break
         except OperationalError:
-            retries -= 1
-            if retries == 0:
+            if attempt == DB_READY_MAX_ATTEMPTS - 1:
                 raise
-            time.sleep(1)
+            await asyncio.sleep(min(8.0, 0.2 * 2**attempt) + random.random() * 0.1)
 
-    db = SessionLocal()
-    try:
-        seed_initial_data(db)
-    finally:
-        db.close()
+    await run_in_threadpool(initialize_schema)
+    await run_in_threadpool(seed_database)
+    await run_in_threadpool(warm_connection_pool)
+
+
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    await close_http_client()
 
 
 @app.get("/")
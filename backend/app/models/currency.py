@@ -1,6 +1,6 @@
-from datetime import datetime, timezone
+from datetime import datetime
 
-from sqlalchemy import DateTime, Float, String
+from sqlalchemy import DateTime, Float, Index, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -8,8 +8,11 @@ from app.db.base import Base
 
 class CurrencyRate(Base):
     __tablename__ = "currency_rates"
+    __table_args__ = (
+        Index("ix_currency_rates_code_covering", "currency_code", unique=True, postgresql_include=["rate_to_usd", "updated_at"]),
+    )
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    currency_code: Mapped[str] = mapped_column(String(10), unique=True, index=True, nullable=False)
+    id: Mapped[int] = mapped_column(primary_key=True)
+    currency_code: Mapped[str] = mapped_column(String(10), nullable=False)
     rate_to_usd: Mapped[float] = mapped_column(Float, nullable=False)
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
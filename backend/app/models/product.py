@@ -1,15 +1,15 @@
-from datetime import datetime, timezone
+from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Float, String
+from sqlalchemy import Boolean, DateTime, Float, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.db.base import Base
+from app.db.base import MONEY, Base
 
 
 class Product(Base):
     __tablename__ = "products"
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     sku: Mapped[str] = mapped_column(String(64), unique=True, index=True, nullable=False)
     name: Mapped[str] = mapped_column(String(160), nullable=False)
     product_type: Mapped[str] = mapped_column(String(80), default="")
@@ -17,16 +17,16 @@ class Product(Base):
     model: Mapped[str] = mapped_column(String(80), default="")
     measure_quantity: Mapped[float] = mapped_column(Float, default=1.0)
     measure_unit: Mapped[str] = mapped_column(String(20), default="unidad")
-    description: Mapped[str] = mapped_column(String(500), default="")
+    description: Mapped[str] = mapped_column(Text, default="")
     invoice_note: Mapped[str] = mapped_column(String(255), default="")
-    cost_amount: Mapped[float] = mapped_column(Float, default=0, nullable=False)
-    base_price_amount: Mapped[float] = mapped_column(Float, default=0, nullable=False)
+    cost_amount: Mapped[float] = mapped_column(MONEY, default=0, nullable=False)
+    base_price_amount: Mapped[float] = mapped_column(MONEY, default=0, nullable=False)
     base_discount_pct: Mapped[float] = mapped_column(Float, default=0, nullable=False)
-    final_customer_price: Mapped[float] = mapped_column(Float, default=0, nullable=False)
-    wholesale_price: Mapped[float] = mapped_column(Float, default=0, nullable=False)
-    retail_price: Mapped[float] = mapped_column(Float, default=0, nullable=False)
+    final_customer_price: Mapped[float] = mapped_column(MONEY, default=0, nullable=False)
+    wholesale_price: Mapped[float] = mapped_column(MONEY, default=0, nullable=False)
+    retail_price: Mapped[float] = mapped_column(MONEY, default=0, nullable=False)
     currency_code: Mapped[str] = mapped_column(String(10), default="USD", nullable=False)
-    price_usd: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    price_usd: Mapped[float] = mapped_column(MONEY, nullable=False, default=0)
     stock: Mapped[int] = mapped_column(default=0, nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
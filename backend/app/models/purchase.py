@@ -1,20 +1,20 @@
-from datetime import datetime, timezone
+from datetime import datetime
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import DateTime, ForeignKey, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.db.base import Base
+from app.db.base import MONEY, Base
 
 
 class Purchase(Base):
     __tablename__ = "purchases"
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), nullable=False, index=True)
     quantity: Mapped[int] = mapped_column(Integer, nullable=False)
-    unit_cost_usd: Mapped[float] = mapped_column(Float, nullable=False)
-    total_usd: Mapped[float] = mapped_column(Float, nullable=False)
+    unit_cost_usd: Mapped[float] = mapped_column(MONEY, nullable=False)
+    total_usd: Mapped[float] = mapped_column(MONEY, nullable=False)
     supplier_name: Mapped[str] = mapped_column(String(140), default="")
     purchase_note: Mapped[str] = mapped_column(String(255), default="")
     created_by: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -1,6 +1,6 @@
-from datetime import datetime, timezone
+from datetime import datetime
 
-from sqlalchemy import DateTime, String
+from sqlalchemy import DateTime, Index, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -8,8 +8,11 @@ from app.db.base import Base
 
 class SystemSetting(Base):
     __tablename__ = "system_settings"
+    __table_args__ = (
+        Index("ix_system_settings_key_covering", "key", unique=True, postgresql_include=["value", "updated_at"]),
+    )
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    key: Mapped[str] = mapped_column(String(80), unique=True, nullable=False, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
+    key: Mapped[str] = mapped_column(String(80), nullable=False)
     value: Mapped[str] = mapped_column(String(120), nullable=False)
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
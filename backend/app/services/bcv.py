@@ -3,32 +3,46 @@ from __future__ import annotations
 import re
 
 import httpx
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+from app.services.http_client import get_http_client
 
 
 BCV_URL = "https://www.bcv.org.ve/"
+BCV_FRESH_KEY = "ridax:bcv:ves:fresh"
+BCV_STALE_KEY = "ridax:bcv:ves:stale"
+BCV_FRESH_TTL = 300
+DECIMAL_COMMA_TABLE = str.maketrans({",": "."})
+THOUSANDS_DOT_TABLE = str.maketrans({".": "", ",": "."})
+BCV_RATE_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"USD\s*</strong>\s*<span[^>]*>\s*([0-9\.,]+)",
+        r"D[oó]lar\s*BCV[^0-9]*([0-9\.,]+)",
+        r"id=['\"]dolar['\"][^>]*>\s*([0-9\.,]+)",
+    )
+)
+
+settings = get_settings()
+redis_client = Redis.from_url(settings.redis_url, socket_timeout=0.25, socket_connect_timeout=0.25)
 
 
 async def fetch_ves_rate_from_bcv() -> float:
     html = ""
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            response = await client.get(BCV_URL)
-            response.raise_for_status()
-            html = response.text
+        response = await get_http_client().get(BCV_URL)
+        response.raise_for_status()
+        html = response.text
     except httpx.HTTPError:
         async with httpx.AsyncClient(timeout=15, verify=False) as insecure_client:
             response = await insecure_client.get(BCV_URL)
             response.raise_for_status()
             html = response.text
 
-    patterns = [
-        r"USD\s*</strong>\s*<span[^>]*>\s*([0-9\.,]+)",
-        r"D[oó]lar\s*BCV[^0-9]*([0-9\.,]+)",
-        r"id=['\"]dolar['\"][^>]*>\s*([0-9\.,]+)",
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, html, flags=re.IGNORECASE)
+    for pattern in BCV_RATE_PATTERNS:
+        match = pattern.search(html)
         if match:
             rate = _parse_decimal(match.group(1))
             if rate > 0:
@@ -37,11 +51,42 @@ async def fetch_ves_rate_from_bcv() -> float:
     raise ValueError("No se pudo extraer tasa USD/VES desde BCV")
 
 
+async def fetch_cached_ves_rate() -> float:
+    fresh = await _read_cached_rate(BCV_FRESH_KEY)
+    if fresh is not None:
+        return fresh
+
+    try:
+        rate = await fetch_ves_rate_from_bcv()
+    except Exception:
+        stale = await _read_cached_rate(BCV_STALE_KEY)
+        if stale is not None:
+            return stale
+        raise
+
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.set(BCV_FRESH_KEY, rate, ex=BCV_FRESH_TTL)
+            pipe.set(BCV_STALE_KEY, rate)
+            await pipe.execute()
+    except RedisError:
+        pass
+    return rate
+
+
+async def _read_cached_rate(key: str) -> float | None:
+    try:
+        raw = await redis_client.get(key)
+    except RedisError:
+        return None
+    return float(raw) if raw is not None else None
+
+
 def _parse_decimal(value: str) -> float:
     cleaned = value.strip().replace(" ", "")
     if "," in cleaned and "." in cleaned:
-        cleaned = cleaned.replace(".", "").replace(",", ".")
+        cleaned = cleaned.translate(THOUSANDS_DOT_TABLE)
     elif "," in cleaned:
-        cleaned = cleaned.replace(",", ".")
+        cleaned = cleaned.translate(DECIMAL_COMMA_TABLE)
 
     return round(float(cleaned), 6)
@@ -1,8 +1,53 @@
 from __future__ import annotations
 
+import asyncio
+
 import httpx
 
 from app.core.config import get_settings
+from app.services.http_client import get_http_client
+
+
+TELEGRAM_SEMAPHORE = asyncio.Semaphore(30)
+WHATSAPP_SEMAPHORE = asyncio.Semaphore(10)
+SEND_MAX_ATTEMPTS = 3
+RETRY_AFTER_STATUS_CODES = frozenset({429, 503})
+MAX_RETRY_AFTER_SECONDS = 30.0
+
+_whatsapp_target: tuple[str, dict[str, str]] | None = None
+
+
+async def post_with_retry(semaphore: asyncio.Semaphore, url: str, **kwargs) -> httpx.Response:
+    for attempt in range(SEND_MAX_ATTEMPTS):
+        async with semaphore:
+            response = await get_http_client().post(url, timeout=10, **kwargs)
+        delay = retry_after_delay(response)
+        if delay is None or attempt == SEND_MAX_ATTEMPTS - 1:
+            break
+        await asyncio.sleep(delay)
+    response.raise_for_status()
+    return response
+
+
+def retry_after_delay(response: httpx.Response) -> float | None:
+    if response.status_code not in RETRY_AFTER_STATUS_CODES:
+        return None
+    try:
+        delay = float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+    return delay if 0 <= delay <= MAX_RETRY_AFTER_SECONDS else None
+
+
+def get_whatsapp_target() -> tuple[str, dict[str, str]]:
+    global _whatsapp_target
+    if _whatsapp_target is None:
+        settings = get_settings()
+        _whatsapp_target = (
+            f"https://graph.facebook.com/v21.0/{settings.whatsapp_phone_number_id}/messages",
+            {"Authorization": f"Bearer {settings.whatsapp_access_token}"},
+        )
+    return _whatsapp_target
 
 
 async def send_telegram_message(chat_id: str, text: str) -> dict:
@@ -11,10 +56,8 @@ async def send_telegram_message(chat_id: str, text: str) -> dict:
         return {"status": "simulated", "channel": "telegram", "message": text}
 
     url = f"https://api.telegram.org/bot{settings.telegram_bot_token}/sendMessage"
-    async with httpx.AsyncClient(timeout=10) as client:
-        response = await client.post(url, json={"chat_id": chat_id, "text": text})
-        response.raise_for_status()
-        return response.json()
+    response = await post_with_retry(TELEGRAM_SEMAPHORE, url, json={"chat_id": chat_id, "text": text})
+    return response.json()
 
 
 async def send_whatsapp_message(phone_number: str, text: str) -> dict:
@@ -22,16 +65,24 @@ async def send_whatsapp_message(phone_number: str, text: str) -> dict:
     if not settings.whatsapp_access_token or not settings.whatsapp_phone_number_id:
         return {"status": "simulated", "channel": "whatsapp", "message": text}
 
-    url = f"https://graph.facebook.com/v21.0/{settings.whatsapp_phone_number_id}/messages"
+    url, headers = get_whatsapp_target()
     payload = {
         "messaging_product": "whatsapp",
         "to": phone_number,
         "type": "text",
         "text": {"body": text},
     }
-    headers = {"Authorization": f"Bearer {settings.whatsapp_access_token}"}
 
-    async with httpx.AsyncClient(timeout=10) as client:
-        response = await client.post(url, json=payload, headers=headers)
-        response.raise_for_status()
-        return response.json()
+    response = await post_with_retry(WHATSAPP_SEMAPHORE, url, json=payload, headers=headers)
+    return response.json()
+
+
+async def broadcast_telegram(chat_ids: list[str], text: str) -> list[dict | BaseException]:
+    return await asyncio.gather(*(send_telegram_message(chat_id, text) for chat_id in chat_ids), return_exceptions=True)
+
+
+async def broadcast_whatsapp(phone_numbers: list[str], text: str) -> list[dict | BaseException]:
+    return await asyncio.gather(
+        *(send_whatsapp_message(phone_number, text) for phone_number in phone_numbers),
+        return_exceptions=True,
+    )
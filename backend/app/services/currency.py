@@ -1,16 +1,35 @@
+import time
+
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models.currency import CurrencyRate
 
 
+RATE_CACHE_TTL = 60.0
+_rate_cache: dict[str, float] = {}
+_rate_cache_loaded_at = 0.0
+
+
+def load_cached_rates(db: Session) -> dict[str, float]:
+    global _rate_cache, _rate_cache_loaded_at
+    if time.monotonic() - _rate_cache_loaded_at >= RATE_CACHE_TTL:
+        _rate_cache = dict(db.execute(select(CurrencyRate.currency_code, CurrencyRate.rate_to_usd)).all())
+        _rate_cache_loaded_at = time.monotonic()
+    return _rate_cache
+
+
+def invalidate_rate_cache() -> None:
+    global _rate_cache_loaded_at
+    _rate_cache_loaded_at = 0.0
+
+
 def convert_amount(db: Session, amount: float, from_currency: str, to_currency: str) -> float:
-    from_rate = db.scalar(
-        select(CurrencyRate).where(CurrencyRate.currency_code == from_currency.upper())
-    )
-    to_rate = db.scalar(select(CurrencyRate).where(CurrencyRate.currency_code == to_currency.upper()))
-    if not from_rate or not to_rate:
+    from_code = from_currency.upper()
+    to_code = to_currency.upper()
+    rates = load_cached_rates(db)
+    if from_code not in rates or to_code not in rates:
         raise ValueError("Moneda no registrada")
 
-    amount_in_usd = amount / from_rate.rate_to_usd
-    return round(amount_in_usd * to_rate.rate_to_usd, 2)
+    amount_in_usd = amount / rates[from_code]
+    return round(amount_in_usd * rates[to_code], 2)
@@ -0,0 +1,25 @@
+import httpx
+
+
+http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global http_client
+    if http_client is None:
+        http_client = httpx.AsyncClient(
+            timeout=15,
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+                retries=3,
+            ),
+        )
+    return http_client
+
+
+async def close_http_client() -> None:
+    global http_client
+    if http_client is not None:
+        await http_client.aclose()
+        http_client = None
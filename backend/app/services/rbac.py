@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-import json
+from functools import lru_cache
+
+import orjson
 
 
 ROLE_PERMISSIONS: dict[str, list[str]] = {
@@ -44,29 +46,31 @@ ROLE_PERMISSIONS: dict[str, list[str]] = {
 }
 
 
+PERMISSION_CATALOG: frozenset[str] = frozenset(perm for perms in ROLE_PERMISSIONS.values() for perm in perms)
+ROLE_PERMISSION_JSON: dict[str, str] = {role_name: orjson.dumps(perms).decode() for role_name, perms in ROLE_PERMISSIONS.items()}
+
+
+@lru_cache(maxsize=1)
 def available_permissions() -> list[str]:
-    catalog: set[str] = set()
-    for perms in ROLE_PERMISSIONS.values():
-        catalog.update(perms)
-    return sorted(catalog)
+    return sorted(PERMISSION_CATALOG)
 
 
 def serialize_permissions(role_name: str) -> str:
-    permissions = ROLE_PERMISSIONS.get(role_name, [])
-    return json.dumps(permissions)
+    return ROLE_PERMISSION_JSON.get(role_name, "[]")
 
 
-def has_permission(permissions_raw: str, permission: str) -> bool:
+@lru_cache(maxsize=64)
+def decode_permissions(permissions_raw: str) -> tuple[str, ...]:
     try:
-        permissions = json.loads(permissions_raw)
-    except json.JSONDecodeError:
-        permissions = []
-    return permission in permissions
+        permissions = orjson.loads(permissions_raw)
+    except orjson.JSONDecodeError:
+        return ()
+    return tuple(permissions) if isinstance(permissions, list) else ()
+
+
+def has_permission(permissions_raw: str, permission: str) -> bool:
+    return permission in decode_permissions(permissions_raw)
 
 
 def parse_permissions(permissions_raw: str) -> list[str]:
-    try:
-        permissions = json.loads(permissions_raw)
-    except json.JSONDecodeError:
-        return []
-    return permissions if isinstance(permissions, list) else []
+    return list(decode_permissions(permissions_raw))
@@ -0,0 +1,77 @@
+import time
+from collections import Counter
+from collections.abc import Callable
+
+import orjson
+from redis import Redis, RedisError
+
+from app.core.config import get_settings
+
+
+CACHE_PREFIX = "ridax:"
+VERSION_PREFIX = "ridax:version:"
+CACHE_RETRY_SECONDS = 30.0
+
+settings = get_settings()
+redis_client = Redis.from_url(settings.redis_url, socket_timeout=0.25, socket_connect_timeout=0.25)
+cache_stats: Counter[str] = Counter()
+_disabled_until = 0.0
+
+
+def _redis_available() -> bool:
+    return time.monotonic() >= _disabled_until
+
+
+def _mark_unavailable() -> None:
+    global _disabled_until
+    _disabled_until = time.monotonic() + CACHE_RETRY_SECONDS
+    cache_stats["errors"] += 1
+
+
+def cached_response(key: str, ttl: int, build: Callable[[], dict]) -> dict:
+    if not _redis_available():
+        cache_stats["bypass"] += 1
+        return build()
+
+    try:
+        raw = redis_client.get(CACHE_PREFIX + key)
+    except RedisError:
+        _mark_unavailable()
+        return build()
+
+    if raw is not None:
+        cache_stats["hits"] += 1
+        return orjson.loads(raw)
+
+    cache_stats["misses"] += 1
+    payload = build()
+    try:
+        redis_client.set(CACHE_PREFIX + key, orjson.dumps(payload), ex=ttl)
+    except RedisError:
+        _mark_unavailable()
+    return payload
+
+
+def invalidate_cached(*keys: str) -> None:
+    if not keys or not _redis_available():
+        return
+    try:
+        with redis_client.pipeline(transaction=False) as pipe:
+            pipe.delete(*(CACHE_PREFIX + key for key in keys))
+            for key in keys:
+                pipe.incr(VERSION_PREFIX + key)
+            pipe.execute()
+    except RedisError:
+        _mark_unavailable()
+
+
+def cache_etag(key: str) -> str | None:
+    if not _redis_available():
+        return None
+    try:
+        redis_client.set(VERSION_PREFIX + key, time.time_ns(), nx=True)
+        version = redis_client.get(VERSION_PREFIX + key)
+    except RedisError:
+        _mark_unavailable()
+        return None
+    return f'W/"{key.replace(":", "-")}-{int(version)}"'
@@ -1,4 +1,7 @@
-from sqlalchemy import select
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.core.security import hash_password
@@ -11,41 +14,45 @@ from app.services.rbac import ROLE_PERMISSIONS, serialize_permissions
 
 
 def seed_initial_data(db: Session) -> None:
-    role_count = db.query(Role).count()
-    if role_count == 0:
-        for role_name in ROLE_PERMISSIONS:
-            db.add(Role(name=role_name, permissions=serialize_permissions(role_name)))
-        db.commit()
+    role_ids = dict(db.execute(select(Role.name, Role.id)).all())
+    if not role_ids:
+        role_ids = dict(
+            db.execute(
+                insert(Role)
+                .values([{"name": role_name, "permissions": serialize_permissions(role_name)} for role_name in ROLE_PERMISSIONS])
+                .returning(Role.name, Role.id)
+            ).all()
+        )
 
-    user_count = db.query(User).count()
-    if user_count == 0:
-        roles = {role.name: role for role in db.scalars(select(Role)).all()}
+    if db.scalar(select(User.id).limit(1)) is None:
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            admin_hash, manager_hash, seller_hash = executor.map(
+                hash_password, ("Admin123!", "Gerente123!", "Vendedor123!")
+            )
         db.add_all(
             [
                 User(
                     email="admin@ridax.local",
                     full_name="Administrador RIDAX",
-                    hashed_password=hash_password("Admin123!"),
-                    role_id=roles["Admin"].id,
+                    hashed_password=admin_hash,
+                    role_id=role_ids["Admin"],
                 ),
                 User(
                     email="gerente@ridax.local",
                     full_name="Gerente RIDAX",
-                    hashed_password=hash_password("Gerente123!"),
-                    role_id=roles["Gerente"].id,
+                    hashed_password=manager_hash,
+                    role_id=role_ids["Gerente"],
                 ),
                 User(
                     email="vendedor@ridax.local",
                     full_name="Vendedor RIDAX",
-                    hashed_password=hash_password("Vendedor123!"),
-                    role_id=roles["Vendedor"].id,
+                    hashed_password=seller_hash,
+                    role_id=role_ids["Vendedor"],
                 ),
             ]
         )
-        db.commit()
 
-    product_count = db.query(Product).count()
-    if product_count == 0:
+    if db.scalar(select(Product.id).limit(1)) is None:
         db.add_all(
             [
                 Product(
@@ -88,31 +95,22 @@ def seed_initial_data(db: Session) -> None:
                 ),
             ]
         )
-        db.commit()
 
-    rates_count = db.query(CurrencyRate).count()
-    if rates_count == 0:
-        db.add_all(
+    db.execute(
+        pg_insert(CurrencyRate)
+        .values(
             [
-                CurrencyRate(currency_code="USD", rate_to_usd=1.0),
-                CurrencyRate(currency_code="EUR", rate_to_usd=0.92),
-                CurrencyRate(currency_code="VES", rate_to_usd=36.5),
-                CurrencyRate(currency_code="MXN", rate_to_usd=17.0),
+                {"currency_code": "USD", "rate_to_usd": 1.0},
+                {"currency_code": "EUR", "rate_to_usd": 0.92},
+                {"currency_code": "VES", "rate_to_usd": 36.5},
+                {"currency_code": "MXN", "rate_to_usd": 17.0},
             ]
         )
-        db.commit()
-
-    ves_rate = db.query(CurrencyRate).filter(CurrencyRate.currency_code == "VES").first()
-    if not ves_rate:
-        db.add(CurrencyRate(currency_code="VES", rate_to_usd=36.5))
-        db.commit()
-
-    setting = db.query(SystemSetting).filter(SystemSetting.key == "operational_currency").first()
-    if not setting:
-        db.add(SystemSetting(key="operational_currency", value="USD"))
-        db.commit()
+        .on_conflict_do_nothing(index_elements=[CurrencyRate.currency_code])
+    )
 
     defaults = {
+        "operational_currency": "USD",
         "receipt_company_name": "RIDAX",
         "receipt_company_phone": "",
         "receipt_company_address": "",
@@ -125,8 +123,8 @@ def seed_initial_data(db: Session) -> None:
         "invoice_tax_percent": "16",
         "ui_theme_mode": "dark",
     }
-    for key, value in defaults.items():
-        row = db.query(SystemSetting).filter(SystemSetting.key == key).first()
-        if not row:
-            db.add(SystemSetting(key=key, value=value))
-    db.commit()
+    db.execute(
+        pg_insert(SystemSetting)
+        .values([{"key": key, "value": value} for key, value in defaults.items()])
+        .on_conflict_do_nothing(index_elements=[SystemSetting.key])
+    )
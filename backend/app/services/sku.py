@@ -2,26 +2,33 @@ from __future__ import annotations
 
 import re
 import unicodedata
+from functools import lru_cache
 
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.models.sku_sequence import SkuSequence
 
 
+NON_ALNUM_PATTERN = re.compile(r"[^A-Za-z0-9]")
+
+
 def _normalize_segment(value: str, fallback: str, max_len: int) -> str:
     raw = (value or "").strip()
     if not raw:
         return fallback
 
+    if raw.isascii() and raw.isalnum():
+        return raw.upper()[:max_len]
+
     ascii_text = unicodedata.normalize("NFKD", raw).encode("ascii", "ignore").decode("ascii")
-    cleaned = re.sub(r"[^A-Za-z0-9]", "", ascii_text).upper()
+    cleaned = NON_ALNUM_PATTERN.sub("", ascii_text).upper()
     if not cleaned:
         return fallback
     return cleaned[:max_len]
 
 
+@lru_cache(maxsize=1024)
 def build_sku_key(brand: str, product_type: str, measure: str) -> str:
     brand_part = _normalize_segment(brand, "GEN", 4)
     type_part = _normalize_segment(product_type, "GEN", 4)
@@ -30,20 +37,16 @@ def build_sku_key(brand: str, product_type: str, measure: str) -> str:
 
 
 def next_sku(db: Session, brand: str, product_type: str, measure: str) -> str:
-    key = build_sku_key(brand, product_type, measure)
+    return next_sku_batch(db, brand, product_type, measure, 1)[0]
+
 
-    for _ in range(3):
-        try:
-            sequence = db.scalar(select(SkuSequence).where(SkuSequence.sequence_key == key).with_for_update())
-            if not sequence:
-                sequence = SkuSequence(sequence_key=key, last_value=0)
-                db.add(sequence)
-                db.flush()
-
-            sequence.last_value += 1
-            db.flush()
-            return f"RIDAX-{key}-{sequence.last_value:05d}"
-        except IntegrityError:
-            db.rollback()
-
-    raise ValueError("No se pudo generar SKU unico")
+def next_sku_batch(db: Session, brand: str, product_type: str, measure: str, count: int) -> list[str]:
+    key = build_sku_key(brand, product_type, measure)
+    statement = pg_insert(SkuSequence).values(sequence_key=key, last_value=count)
+    last_value = db.scalar(
+        statement.on_conflict_do_update(
+            index_elements=[SkuSequence.sequence_key],
+            set_={"last_value": SkuSequence.last_value + statement.excluded.last_value},
+        ).returning(SkuSequence.last_value)
+    )
+    return [f"RIDAX-{key}-{value:05d}" for value in range(last_value - count + 1, last_value + 1)]
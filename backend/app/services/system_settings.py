@@ -0,0 +1,24 @@
+import time
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.system_setting import SystemSetting
+
+
+SETTINGS_CACHE_TTL = 10.0
+_settings_cache: dict[str, str] = {}
+_settings_loaded_at = 0.0
+
+
+def load_cached_settings(db: Session) -> dict[str, str]:
+    global _settings_cache, _settings_loaded_at
+    if time.monotonic() - _settings_loaded_at >= SETTINGS_CACHE_TTL:
+        _settings_cache = dict(db.execute(select(SystemSetting.key, SystemSetting.value)).all())
+        _settings_loaded_at = time.monotonic()
+    return _settings_cache
+
+
+def invalidate_settings_cache() -> None:
+    global _settings_loaded_at
+    _settings_loaded_at = 0.0